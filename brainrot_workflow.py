@@ -1,32 +1,257 @@
 #!/usr/bin/env python3
 import asyncio
+import json
 import os
 import argparse
+import atexit
 import random
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+try:
+    import av  # PyAV, installed alongside faster-whisper
+except ImportError:
+    av = None
 
 # Import modules
 from downloader import VideoDownloader
 from highlights import HighlightExtractor
-from video_formatter import VideoFormatter
-from movie import load_whisper_model, create_audio, transcribe_audio, add_subtitle
-from subtitle_styles import SUBTITLE_STYLES
+from video_formatter import VideoFormatter, ENCODER_THREADS, detect_h264_encoder, h264_encoder_args, hwaccel_decode_args, gpu_scale
+from movie import load_whisper_model, warm_up_whisper_model, create_batched_pipeline, transcribe_audio, transcribe_audio_batch, detect_language, format_ass_time
+from subtitle_styles import SUBTITLE_STYLES, compile_ass_style, words_to_ass
+
+# Speech chunks per batched Whisper encoder pass
+WHISPER_BATCH_SIZE = 16
+
+# Clips transcribed together in one batched Whisper call; a 10-40s clip is one or two
+# 30s chunks, so this many clips roughly fill a WHISPER_BATCH_SIZE batch
+WHISPER_CLIPS_PER_CALL = 8
+
+# Workers CTranslate2 runs side by side inside the one loaded Whisper model; without a
+# BatchedInferencePipeline, this many clips are transcribed at once instead of one by one
+WHISPER_WORKERS = 2
+
+# Whisper calls (load, warm-up, transcription) run on these dedicated threads, one per model
+# worker, so the default executor stays free for FFmpeg waits
+TRANSCRIBE_POOL = ThreadPoolExecutor(max_workers=WHISPER_WORKERS, thread_name_prefix="whisper")
+
+# Extra seconds of background prebuilt beyond the longest clip, so each clip can start somewhere different
+BACKGROUND_START_WINDOW = 60
+
+# Bytes of a subprocess's stderr kept for error messages; FFmpeg logs progress for the
+# whole encode, and only the end of it ever gets reported
+STDERR_TAIL_BYTES = 8192
+
+# Keep FFmpeg's stderr to warnings and errors, without the banner or per-frame stats lines;
+# that is all the error messages use, and there is far less for each encode to write and drain
+FFMPEG_LOG_ARGS = ["-hide_banner", "-nostats", "-loglevel", "warning"]
+
+# Per-stage time budgets in seconds for a single clip, so a hung probe or FFmpeg is given
+# up on quickly and the other clips in the pipeline keep the encoders busy
+PROBE_TIMEOUT = 60
+FORMAT_TIMEOUT = 120  # Background preparation, audio decodes and stream-copy remuxes
+RENDER_TIMEOUT = 300  # Full encodes
+
+# Audio codecs the final render can stream-copy into MP4 unchanged
+MP4_COPY_AUDIO_CODECS = {"aac", "mp3"}
+
+# Strip between the clip and the background; generated by a color= source inside each
+# render's filter graph, so it never exists as a file or a separate FFmpeg process
+SEPARATOR_HEIGHT = 4
+SEPARATOR_COLOR = "0x333333"
+
+# File types picked up as background videos from the assets folder
+BACKGROUND_VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi"}
+
+# RAM-backed directory for intermediates, and the free space it needs before we use it
+TMPFS_DIR = "/dev/shm"
+TMPFS_MIN_FREE_BYTES = 4 * 1024 ** 3
+
+# tmpfs temp dirs created by this process; one atexit hook removes whatever is left of them
+_tmpfs_temp_dirs = set()
+
+def _remove_tmpfs_temp_dirs():
+    for temp_dir in _tmpfs_temp_dirs:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+atexit.register(_remove_tmpfs_temp_dirs)
+
+def create_tmpfs_temp_dir():
+    """Create a per-run temp directory on tmpfs, or return None if there is none with enough room
+    
+    Intermediates are written once and read back straight away, so keeping them in
+    the page cache avoids round-tripping every clip through the disk.
+    """
+    try:
+        if not os.path.isdir(TMPFS_DIR) or shutil.disk_usage(TMPFS_DIR).free < TMPFS_MIN_FREE_BYTES:
+            return None
+        temp_dir = tempfile.mkdtemp(prefix=f"brainrot_{os.getpid()}_", dir=TMPFS_DIR)
+    except OSError:
+        return None
+    # RAM is only returned when the directory goes, so remove it even if the process dies
+    _tmpfs_temp_dirs.add(temp_dir)
+    return Path(temp_dir)
+
+def probe_with_av(video_path):
+    """Read width, height and duration in-process through libavformat, without spawning ffprobe"""
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        if container.duration is not None:
+            duration = container.duration / av.time_base
+        else:
+            duration = float(stream.duration * stream.time_base)
+        audio = container.streams.audio
+        audio_codec = audio[0].codec_context.name if audio else None
+        return {"width": stream.width, "height": stream.height, "duration": duration, "audio_codec": audio_codec}
+
+def run_command(cmd, timeout=RENDER_TIMEOUT):
+    """Run a command to completion, keeping all of stdout but only the tail of stderr
+    
+    stderr is drained on a helper thread into a buffer capped at STDERR_TAIL_BYTES, so
+    a long encode's progress output doesn't pile up in memory. Returns
+    (returncode, stdout, stderr_tail); raises subprocess.TimeoutExpired after killing
+    the command if it runs longer than timeout seconds.
+    """
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_tail = bytearray()
+    
+    def drain_stderr():
+        while chunk := process.stderr.read1(65536):
+            stderr_tail.extend(chunk)
+            del stderr_tail[:-STDERR_TAIL_BYTES]
+    
+    timed_out = threading.Event()
+    def kill_on_timeout():
+        timed_out.set()
+        process.kill()
+    
+    reader = threading.Thread(target=drain_stderr, daemon=True)
+    timer = threading.Timer(timeout, kill_on_timeout)
+    reader.start()
+    timer.start()
+    try:
+        stdout = process.stdout.read()
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+        reader.join()
+        process.stdout.close()
+        process.stderr.close()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode, stdout, bytes(stderr_tail)
+
+@lru_cache(maxsize=256)
+def probe_video_file(video_path, mtime_ns, size):
+    """Probe width, height, duration and audio codec, in-process with PyAV when available
+    
+    Falls back to a single JSON ffprobe call if PyAV is missing or cannot read the file.
+    Cached for the life of the process; mtime_ns and size are part of the key, so a
+    rewritten file is probed again.
+    """
+    if av is not None:
+        try:
+            return probe_with_av(video_path)
+        except Exception as e:
+            print(f"PyAV probe failed for {video_path}, falling back to ffprobe: {e}")
+    
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name,width,height,duration:format=duration",
+        "-read_intervals", "%+#1",  # Stop after the first packet; nothing else is needed
+        "-print_format", "json",
+        str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    info = json.loads(result.stdout.decode())
+    streams = info["streams"]
+    video_stream = next(stream for stream in streams if stream.get("codec_type") == "video")
+    audio_stream = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    duration = info.get("format", {}).get("duration") or video_stream.get("duration")
+    return {
+        "width": int(video_stream["width"]),
+        "height": int(video_stream["height"]),
+        "duration": float(duration),
+        "audio_codec": audio_stream["codec_name"] if audio_stream else None
+    }
+
+@lru_cache(maxsize=16)
+def scan_background_videos(assets_dir, mtime_ns):
+    """List the background videos in an assets folder, cached until the folder changes
+    
+    One scandir pass with a suffix check, rather than one glob traversal per extension.
+    """
+    with os.scandir(assets_dir) as entries:
+        return tuple(
+            entry.path for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in BACKGROUND_VIDEO_EXTENSIONS and entry.is_file()
+        )
+
+def is_faststart(video_path):
+    """True if an MP4's moov atom comes before its mdat, i.e. it can start playing before it is fully loaded"""
+    try:
+        with open(video_path, "rb") as f:
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                box_size = int.from_bytes(header[:4], "big")
+                box_type = header[4:8]
+                if box_type == b"moov":
+                    return True
+                if box_type == b"mdat":
+                    return False
+                if box_size == 1:  # 64-bit size follows the type
+                    box_size = int.from_bytes(f.read(8), "big")
+                    f.seek(box_size - 16, os.SEEK_CUR)
+                elif box_size >= 8:
+                    f.seek(box_size - 8, os.SEEK_CUR)
+                else:  # Box runs to end of file (0) or is malformed
+                    return False
+    except OSError:
+        return False
 
 class BrainrotWorkflow:
-    def __init__(self, output_dir="output", temp_dir=None, subtitle_style="default"):
+    def __init__(self, output_dir="output", temp_dir=None, subtitle_style="default", progress_queue=None, whisper_model=None, crf=23):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
+        # Prefer tmpfs for intermediates, falling back to a temp folder in the output directory
+        self.temp_dir_is_tmpfs = False
+        if temp_dir is None:
+            temp_dir = create_tmpfs_temp_dir()
+            self.temp_dir_is_tmpfs = temp_dir is not None
         if temp_dir is None:
             temp_dir = self.output_dir / "temp"
         self.temp_dir = Path(temp_dir)
         self.temp_dir.mkdir(exist_ok=True)
         
-        # Store subtitle style
+        # Store subtitle style, resolved to its ASS values once rather than per clip
         self.subtitle_style = subtitle_style
+        self.set_subtitle_config(SUBTITLE_STYLES.get(subtitle_style, SUBTITLE_STYLES["default"]))
+        
+        # Quality (x264 CRF scale) of the delivered clips' encode
+        self.crf = crf
+        
+        # Optional asyncio.Queue that receives progress events for the UI
+        self.progress_queue = progress_queue
+        
+        # Optional preloaded Whisper model (e.g. cached by the Streamlit app)
+        self.whisper_model = whisper_model
+        self.batched_whisper = None
+        # All clips come from one video, so Whisper's language detection runs only once
+        self.whisper_language = None
+        self.whisper_language_detected = False  # Set once tried, so a failed detection isn't retried per group
+        
+        # Background source path -> (prebuilt 1080px-wide loop, its duration), filled once per run
+        self.prebuilt_backgrounds = {}
         
         # Initialize components
         self.downloader = VideoDownloader(str(self.output_dir))
@@ -41,45 +266,51 @@ class BrainrotWorkflow:
         # Get system information for optimal performance settings
         cpu_count = os.cpu_count() or 4
         
-        # Create semaphores for resource control with higher concurrency limits
-        self.io_semaphore = asyncio.Semaphore(16)  # Increased from 8 to 16 for I/O bound operations
-        self.cpu_semaphore = asyncio.Semaphore(cpu_count + 2)  # Added +2 as buffer for CPU operations
+        # Single gate for FFmpeg encodes: each libx264 encode already runs ENCODER_THREADS
+        # threads, so more concurrent encodes than cores / ENCODER_THREADS only thrash the CPU.
+        # Stream copies, probes and audio decodes are cheap and run ungated.
+        self.encode_concurrency = max(1, cpu_count // ENCODER_THREADS)
+        self.ffmpeg_semaphore = asyncio.Semaphore(self.encode_concurrency)
         
-        # Significantly increase FFmpeg parallelism since most bottlenecks are I/O bound rather than CPU bound
-        # FFmpeg processes can run in parallel with less resource contention than previously allowed
-        self.ffmpeg_semaphore = asyncio.Semaphore(min(cpu_count * 3, 24))  # Triple capacity, up to 24 concurrent processes
-        
-        # Create larger executor pools for better throughput
-        self.process_pool = ProcessPoolExecutor(max_workers=min(cpu_count, 6))  # Increased from 4 to 6
-        self.thread_pool = ThreadPoolExecutor(max_workers=32)  # Doubled from 16 to 32
+        # Probe the H.264 encoder once up front rather than inside the first parallel clip
+        detect_h264_encoder()
+        gpu_scale(1080, 1920)  # Likewise the cached scale_cuda check behind GPU scaling
         
         print(f"BrainrotWorkflow initialized with output_dir={output_dir}, temp_dir={temp_dir}")
-        print(f"System has {cpu_count} CPUs, configured for optimal parallel processing")
+        print(f"System has {cpu_count} CPUs, running up to {self.encode_concurrency} encodes at once")
 
-    async def run_subprocess(self, cmd, check=True, timeout=300):
-        """Run a subprocess asynchronously with timeout"""
+    async def run_subprocess(self, cmd, check=True, timeout=RENDER_TIMEOUT):
+        """Run a subprocess asynchronously with timeout
+        
+        The blocking run_command goes to a worker thread: Popen launches via vfork/posix_spawn
+        rather than a full fork of this (model-sized) process, the child is killed on timeout,
+        and only the tail of stderr is returned.
+        """
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
-            if check and process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                raise Exception(f"Command failed with code {process.returncode}: {error_msg}")
-            return process.returncode, stdout, stderr
-        except asyncio.TimeoutError:
-            try:
-                process.kill()
-            except:
-                pass
+            returncode, stdout, stderr = await asyncio.to_thread(run_command, cmd, timeout)
+        except subprocess.TimeoutExpired:
             raise Exception(f"Command timed out after {timeout} seconds")
+        if check and returncode != 0:
+            error_msg = stderr.decode(errors="replace") if stderr else "Unknown error"
+            raise Exception(f"Command failed with code {returncode}: {error_msg}")
+        return returncode, stdout, stderr
+
+    async def report_progress(self, msg_type, **fields):
+        """Push a progress event to the attached progress queue, if any
+        
+        Works with both asyncio.Queue and multiprocessing (Manager) queues.
+        """
+        if self.progress_queue is not None:
+            result = self.progress_queue.put({"type": msg_type, **fields})
+            if asyncio.iscoroutine(result):
+                await result
 
     async def download_video(self, url):
         """Download video from YouTube"""
         print("\n=== STEP 1: DOWNLOADING VIDEO ===")
-        input_video = self.downloader.download_youtube(url)
+        # yt-dlp blocks, so run it in a thread; the model load and background lookup
+        # started alongside it need the event loop in the meantime
+        input_video = await asyncio.to_thread(self.downloader.download_youtube, url)
         if not input_video:
             raise Exception("Failed to download video")
         print(f"✅ Downloaded video to: {input_video}")
@@ -99,18 +330,6 @@ class BrainrotWorkflow:
         print(f"✅ Extracted {len(highlight_clips)} highlight clips")
         return highlight_clips
 
-    async def format_for_mobile_async(self, video_path, clip_index):
-        """Format a video for mobile viewing asynchronously"""
-        clip_basename = Path(video_path).stem
-        output_filename = f"mobile_highlight_{clip_index}.mp4"
-        print(f"Formatting clip {clip_index} for mobile viewing: {clip_basename}")
-        formatted_clip = await asyncio.to_thread(
-            self.formatter.format_for_mobile,
-            str(video_path),
-            output_filename
-        )
-        return formatted_clip
-            
     async def find_background_video(self, specified_path=None, use_dynamic=False):
         """Find an appropriate background video
         
@@ -141,19 +360,13 @@ class BrainrotWorkflow:
             Path(os.path.expanduser("~/FR8/Brainrot Automacion/assets"))
         ]
         
-        assets_dir = None
-        for asset_path in possible_asset_paths:
-            if asset_path.exists() and asset_path.is_dir():
-                assets_dir = asset_path
-                break
+        assets_dir = next((asset_path for asset_path in possible_asset_paths if asset_path.is_dir()), None)
                 
         if not assets_dir:
             raise Exception("Could not find assets directory")
             
         # Find all video files in assets directory
-        background_videos = []
-        for ext in ["mp4", "mov", "avi"]:
-            background_videos.extend([str(f) for f in assets_dir.glob(f"*.{ext}")])
+        background_videos = list(scan_background_videos(str(assets_dir), assets_dir.stat().st_mtime_ns))
             
         if not background_videos:
             raise Exception("No suitable background videos found in assets directory")
@@ -174,50 +387,45 @@ class BrainrotWorkflow:
         
         return bg_video
 
-    async def _extract_audio(self, video_path):
-        """Extract audio from video asynchronously with optimized settings"""
+    async def extract_audio_array(self, video_path):
+        """Decode a clip's audio straight into memory as 16 kHz mono float32, Whisper's input format
+        
+        FFmpeg writes raw samples to a pipe, so no audio file is written or re-read.
+        """
         try:
-            # Create an optimized output filename
-            audio_path = str(self.temp_dir / f"{Path(video_path).stem}.mp3")
-            
-            # Use optimized FFmpeg command for audio extraction
-            # Lower quality (128k) is sufficient for speech recognition
             cmd = [
-                "ffmpeg", "-y",
-                "-i", video_path,
+                "ffmpeg", "-v", "error",
+                "-i", str(video_path),
                 "-vn",  # No video
-                "-c:a", "libmp3lame",  # Use MP3 encoding which is faster than AAC
-                "-q:a", "4",  # Use quality-based VBR encoding (faster than CBR)
-                "-ac", "1",  # Convert to mono (sufficient for speech, faster processing)
-                audio_path
+                "-ac", "1",
+                "-ar", "16000",
+                "-f", "f32le",
+                "-"
             ]
             
-            async with self.io_semaphore:  # Use I/O semaphore instead of FFmpeg semaphore
-                await self.run_subprocess(cmd)
-                
-            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
-                print(f"Successfully extracted audio to: {audio_path}")
-                return audio_path
-            else:
-                print(f"⚠️ Failed to extract audio: output file is empty or missing")
+            _, stdout, _ = await self.run_subprocess(cmd, timeout=FORMAT_TIMEOUT)
+            
+            audio = np.frombuffer(stdout, dtype=np.float32)
+            if audio.size == 0:
+                print(f"⚠️ Failed to extract audio: no samples decoded from {video_path}")
                 return None
+            return audio
                 
         except Exception as e:
             print(f"⚠️ Error extracting audio: {e}")
             return None
     
-    async def _transcribe_audio(self, model, audio_path):
-        """Transcribe audio with more efficient resource utilization and parallelism"""
+    async def _transcribe_audio(self, model, audio, batch_size=None):
+        """Transcribe audio (a file path or a 16 kHz float32 array) with bounded resources"""
         try:
-            print(f"Transcribing audio: {audio_path}")
-            
-            # Use a thread pool to run the CPU-intensive transcription
-            # with bounded timeout to prevent hanging
-            async with self.cpu_semaphore:  # Limit concurrent transcriptions to avoid memory issues
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(transcribe_audio, model, audio_path),
-                    timeout=120  # 2-minute timeout for transcription
-                )
+            print(f"Transcribing audio: {audio if isinstance(audio, str) else f'{audio.size / 16000:.1f}s in memory'}")
+            
+            # Run the transcription on the Whisper thread with a bounded timeout to prevent hanging
+            loop = asyncio.get_running_loop()
+            result = await asyncio.wait_for(
+                loop.run_in_executor(TRANSCRIBE_POOL, transcribe_audio, model, audio, batch_size, self.whisper_language),
+                timeout=120  # 2-minute timeout for transcription
+            )
             
             # Validate result
             if not result:
@@ -257,82 +465,125 @@ class BrainrotWorkflow:
             traceback.print_exc()
             return [{"word": "TRANSCRIPTION FAILED", "start": 0.0, "end": 5.0}]
 
-    async def stack_videos_async(self, main_clip, background_clip, duration):
-        """Optimized stacking of videos with better parallelism and faster encoding"""
-        clip_basename = Path(main_clip).stem
-        clip_index = clip_basename.split('_')[-1] if '_' in clip_basename else '0'
+    async def _transcribe_audio_batch(self, model, audios, batch_size):
+        """Transcribe several in-memory clips in one batched call; one wordlevel list per clip"""
+        print(f"Transcribing {len(audios)} clips in one batch ({sum(audio.size for audio in audios) / 16000:.1f}s of audio)")
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    TRANSCRIBE_POOL, lambda: transcribe_audio_batch(model, audios, batch_size, language=self.whisper_language)
+                ),
+                timeout=120 * len(audios)  # Same 2-minute budget per clip as single transcriptions
+            )
+        except asyncio.TimeoutError:
+            print("⚠️ Batch transcription timed out")
+            return [[{"word": "TRANSCRIPTION TIMEOUT", "start": 0.0, "end": 5.0}] for _ in audios]
+
+    async def iter_transcriptions(self, whisper_model, highlight_clips):
+        """Decode the clips' audio and transcribe them group by group
+        
+        With a BatchedInferencePipeline, up to WHISPER_CLIPS_PER_CALL clips go through
+        the model in one call so their speech chunks share encoder batches; otherwise
+        WHISPER_WORKERS clips are transcribed concurrently on the model's workers. The first
+        clip is transcribed alone so rendering can start as early as possible. Yields
+        (clip_index, wordlevel_info) as soon as each group finishes, so renders overlap
+        with the next group's transcription.
+        """
+        if self.batched_whisper is None and whisper_model is not None:
+            self.batched_whisper = create_batched_pipeline(whisper_model)
+        model = self.batched_whisper or whisper_model
+        batch_size = WHISPER_BATCH_SIZE if self.batched_whisper else None
+        
+        clip_indices = list(range(len(highlight_clips)))
+        group_size = WHISPER_CLIPS_PER_CALL if self.batched_whisper else WHISPER_WORKERS
+        groups = [clip_indices[:1]] + [clip_indices[i:i + group_size] for i in range(1, len(clip_indices), group_size)]
+        
+        async def extract_group(group):
+            return await asyncio.gather(*(self.extract_audio_array(highlight_clips[i]) for i in group))
+        
+        # Decode the next group's audio while the current one is transcribed, keeping
+        # at most two groups of samples in memory
+        next_audios = asyncio.create_task(extract_group(groups[0])) if highlight_clips else None
+        for group_number, group in enumerate(groups):
+            if not group:
+                continue
+            audios = await next_audios
+            if group_number + 1 < len(groups):
+                next_audios = asyncio.create_task(extract_group(groups[group_number + 1]))
+            
+            transcripts = {i: [{"word": "NO TRANSCRIPTION", "start": 0.0, "end": 5.0}] for i in group}
+            decoded = [(i, audio) for i, audio in zip(group, audios) if audio is not None]
+            if decoded and model is not None and not self.whisper_language_detected:
+                self.whisper_language_detected = True
+                try:
+                    self.whisper_language = await asyncio.wait_for(
+                        asyncio.get_running_loop().run_in_executor(TRANSCRIBE_POOL, detect_language, model, decoded[0][1]),
+                        timeout=120  # Same budget as a single transcription
+                    )
+                except asyncio.TimeoutError:
+                    print("⚠️ Language detection timed out, detecting per clip")
+                print(f"Detected language: {self.whisper_language}")
+            if decoded and model is not None:
+                for i, _ in decoded:
+                    await self.report_progress("step", step=3, highlight=i + 1, description="Transcribing")
+                if len(decoded) == 1:
+                    i, audio = decoded[0]
+                    transcripts[i] = await self._transcribe_audio(model, audio, batch_size)
+                elif self.batched_whisper:
+                    results = await self._transcribe_audio_batch(model, [audio for _, audio in decoded], batch_size)
+                    transcripts.update({i: result for (i, _), result in zip(decoded, results)})
+                else:
+                    results = await asyncio.gather(*(self._transcribe_audio(model, audio) for _, audio in decoded))
+                    transcripts.update({i: result for (i, _), result in zip(decoded, results)})
+            
+            for i in group:
+                print(f"✅ Transcription complete for clip {i+1} with {len(transcripts[i])} words")
+                yield i, transcripts[i]
+
+    async def stack_videos_async(self, main_clip, background_clip, duration, clip_index=None, main_size=None, background_start=0):
+        """Optimized stacking of videos with better parallelism and faster encoding
+        
+        main_size is main_clip's (width, height), when already known; the output is always 1080x1920.
+        The background is read from background_start for duration seconds, in place.
+        """
+        if clip_index is None:
+            clip_basename = Path(main_clip).stem
+            clip_index = clip_basename.split('_')[-1] if '_' in clip_basename else '0'
         output_filename = f"stacked_mobile_highlight_{clip_index}.mp4"
-        output_path = self.temp_dir / output_filename
-        
-        # Get main clip dimensions using asyncio
-        probe_cmd = [
-            "ffprobe", "-v", "error", 
-            "-select_streams", "v:0", 
-            "-show_entries", "stream=width,height", 
-            "-of", "csv=p=0", 
-            str(main_clip)
-        ]
-        _, stdout, _ = await self.run_subprocess(probe_cmd)
+        output_path = self.clip_temp_dir(clip_index) / output_filename
         
-        main_width, main_height = map(int, stdout.decode().strip().split(','))
+        # Get main clip dimensions
+        main_width, main_height = main_size or await self.get_video_dimensions(main_clip)
         
         # Calculate dimensions for stacking
         target_width = 1080
-        main_target_height = min(int(main_height * (target_width / main_width)), int(1920 * 0.35))
-        main_target_height = max(main_target_height, int(1920 * 0.25))  # At least 25% of height
-        main_target_height = self.ensure_even_dimensions(target_width, main_target_height)[1]
+        main_target_height = self.get_top_section_height(main_width, main_height)
+        # This is the fallback for failed fused renders, so it scales on the CPU: that
+        # works for any input, including ones the GPU path can't handle
+        main_input_args, main_scale = hwaccel_decode_args(), f"scale={target_width}:{main_target_height}"
         
         if background_clip and os.path.exists(background_clip):
-            # Run two FFmpeg operations in parallel
-            main_scaled = self.temp_dir / f"main_scaled_highlight_{clip_index}.mp4"
-            gradient = self.temp_dir / f"gradient_highlight_{clip_index}.mp4"
-            
-            # Create commands with optimized settings
-            main_scale_cmd = [
-                "ffmpeg", "-y",
-                "-i", str(main_clip),
-                "-vf", f"scale={target_width}:{main_target_height}:force_original_aspect_ratio=disable,setsar=1:1",
-                "-c:v", "libx264", "-crf", "24", "-preset", "veryfast",  # Use veryfast preset
-                "-tune", "fastdecode",  # Optimize for faster decoding
-                "-c:a", "aac", "-b:a", "128k",  # Reduced audio bitrate
-                str(main_scaled)
-            ]
-            
-            gradient_height = 4
-            gradient_cmd = [
-                "ffmpeg", "-y",
-                "-f", "lavfi",
-                "-i", f"color=c=0x333333:s=1080x{gradient_height}:d={duration}:r=30",
-                "-c:v", "libx264", "-crf", "24", "-preset", "veryfast",
-                str(gradient)
-            ]
-            
-            # Run both in parallel
-            tasks = [
-                self._run_ffmpeg_with_semaphore(main_scale_cmd),
-                self._run_ffmpeg_with_semaphore(gradient_cmd)
-            ]
-            
-            # Wait for both to finish
-            await asyncio.gather(*tasks)
-            
-            # Now stack the videos with optimized settings
+            # Scale the main clip, add the separator strip and stack over the background
+            # in one pass; the strip is a color source rather than an encoded input
             stack_cmd = [
-                "ffmpeg", "-y",
-                "-i", str(main_scaled),
-                "-i", str(gradient),
-                "-i", str(background_clip),
-                "-filter_complex", "[0:v][1:v][2:v]vstack=inputs=3[v]",
+                "ffmpeg", "-y", *FFMPEG_LOG_ARGS,
+                *main_input_args, "-i", str(main_clip),
+                *hwaccel_decode_args(), "-ss", f"{background_start:.2f}", "-t", str(duration), "-i", str(background_clip),
+                "-filter_complex", (
+                    f"[0:v]{main_scale},setsar=1:1[top];"
+                    f"color=c={SEPARATOR_COLOR}:s={target_width}x{SEPARATOR_HEIGHT}:d={duration}:r=30[gap];"
+                    "[top][gap][1:v]vstack=inputs=3[v]"
+                ),
                 "-map", "[v]",
-                "-map", "0:a",
-                "-c:v", "libx264", "-crf", "24", "-preset", "veryfast",
-                "-tune", "fastdecode",
+                "-map", "0:a?",
+                *h264_encoder_args(crf=24, preset="veryfast", tune="fastdecode"),
                 "-c:a", "aac", "-b:a", "128k",
                 "-movflags", "+faststart",  # Optimize for web streaming
                 str(output_path)
             ]
             
-            await self._run_ffmpeg_with_semaphore(stack_cmd)
+            await self._run_ffmpeg_with_semaphore(stack_cmd, timeout=RENDER_TIMEOUT)
             
             if output_path.exists():
                 return str(output_path)
@@ -340,20 +591,25 @@ class BrainrotWorkflow:
         # Fallback to single-pass solution with optimized settings
         print(f"⚠️ Using fallback method for clip {clip_index}")
         pad_cmd = [
-            "ffmpeg", "-y",
-            "-i", str(main_clip),
-            "-vf", f"scale={target_width}:{main_target_height},pad={target_width}:1920:0:0:color=black",
-            "-c:v", "libx264", "-crf", "24", "-preset", "veryfast",
-            "-tune", "fastdecode",
+            "ffmpeg", "-y", *FFMPEG_LOG_ARGS,
+            *main_input_args, "-i", str(main_clip),
+            "-vf", f"{main_scale},pad={target_width}:1920:0:0:color=black",
+            *h264_encoder_args(crf=24, preset="veryfast", tune="fastdecode"),
             "-c:a", "aac", "-b:a", "128k",
             "-movflags", "+faststart",
             str(output_path)
         ]
         
-        await self._run_ffmpeg_with_semaphore(pad_cmd)
+        await self._run_ffmpeg_with_semaphore(pad_cmd, timeout=RENDER_TIMEOUT)
         return str(output_path)
 
-    async def _run_ffmpeg_with_semaphore(self, cmd, timeout=300):
+    def clip_temp_dir(self, clip_index):
+        """Per-clip folder for a clip's intermediates, so it can be removed as soon as the clip is done"""
+        clip_dir = self.temp_dir / f"highlight_{clip_index}"
+        clip_dir.mkdir(exist_ok=True)
+        return clip_dir
+
+    async def _run_ffmpeg_with_semaphore(self, cmd, timeout=RENDER_TIMEOUT):
         """Helper method to run ffmpeg with semaphore protection and optimized timeout handling
         
         This uses a streamlined approach with timeouts and better error handling.
@@ -365,277 +621,212 @@ class BrainrotWorkflow:
                 if os.name != 'nt':  # Not Windows
                     cmd = ["nice", "-n", "10"] + cmd
                     
-                # Set specific timeout for this process
-                return await asyncio.wait_for(
-                    self.run_subprocess(cmd, check=False),  # Don't throw exceptions
-                    timeout=timeout
-                )
-        except asyncio.TimeoutError:
-            print(f"⚠️ FFmpeg command timed out after {timeout}s: {' '.join(cmd[:5])}...")
-            return None, None, b"Timeout"
+                # Set specific timeout for this process; run_subprocess kills it when it expires
+                return await self.run_subprocess(cmd, check=False, timeout=timeout)  # Don't throw on exit codes
         except Exception as e:
             print(f"⚠️ Error running FFmpeg: {e}")
             return None, None, str(e).encode()
 
+    def get_top_section_height(self, width, height, target_width=1080):
+        """Height of the main clip strip in the 1080x1920 stack: 25-35% of the frame, even"""
+        # Clamp the scaled source height into [25%, 35%] and round down to even in one go;
+        # the bottom section is then 1920 minus even numbers, so it is even as well
+        scaled_height = int(height * (target_width / width))
+        return max(min(scaled_height, int(1920 * 0.35)), int(1920 * 0.25)) & ~1
+
     def ensure_even_dimensions(self, width, height):
         """Ensure both width and height are even numbers, required by most video codecs"""
-        width = int(width)
-        height = int(height)
-        if width % 2 != 0:
-            width += 1
-        if height % 2 != 0:
-            height += 1
-        return width, height
+        # Round odd values up to the next even number without branching
+        return (int(width) + 1) & ~1, (int(height) + 1) & ~1
 
-    async def get_video_duration(self, video_path):
-        """Get the duration of a video asynchronously"""
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(video_path)
-        ]
-        async with self.ffmpeg_semaphore:
-            _, stdout, _ = await self.run_subprocess(cmd)
-        return float(stdout.decode().strip())
+    async def probe_video(self, video_path):
+        """Probe width, height and duration of a video, reusing earlier probes of the same file"""
+        stat = os.stat(video_path)
+        info = await asyncio.to_thread(probe_video_file, str(video_path), stat.st_mtime_ns, stat.st_size)
+        return dict(info)  # Callers get their own copy of the cached result
 
-    async def add_subtitles_async(self, video_path, whisper_model, clip_index, wordlevel_info=None):
-        """Add subtitles to video using pre-computed wordlevel info with selected style"""
-        clip_basename = Path(video_path).stem
-        # Create a unique output directory for this clip to avoid conflicts
-        clip_output_dir = self.temp_dir / f"subtitled_{clip_index}"
-        os.makedirs(clip_output_dir, exist_ok=True)
-        
-        if not wordlevel_info:
-            print(f"⚠️ No transcription data for clip {clip_index}")
-            return video_path
-            
-        try:
-            # Get style configuration
-            style_config = SUBTITLE_STYLES.get(self.subtitle_style, SUBTITLE_STYLES["default"])
-            
-            # Extract style parameters
-            font_size = style_config.get("font_size", 24)
-            text_color = style_config.get("text_color", "FFFF00")
-            use_outline = style_config.get("use_outline", True)
-            outline_color = style_config.get("outline_color", "000000") if use_outline else None
-            
-            # Config for subtitles
-            v_type = "9x16"
-            
-            # Calculate suitable position
-            probe_cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=width,height", 
-                "-of", "csv=p=0", 
-                str(video_path)
-            ]
-            
-            async with self.ffmpeg_semaphore:
-                _, stdout, _ = await self.run_subprocess(probe_cmd)
-            
-            width, height = map(int, stdout.decode().strip().split(','))
-            
-            # Position subtitles at 40% from top
-            subs_position = (width / 2, height * 0.4)
-            
-            # Try to add subtitles using the movie.py function
-            try:
-                # Use the color parameter passed from the style
-                output_path, _ = add_subtitle(
-                    video_path,
-                    None,  # No need for audio path since we have wordlevel_info
-                    v_type,
-                    subs_position,
-                    None,  # No highlight color
-                    font_size,
-                    0.0,  # No background
-                    12,   # Max chars per line
-                    f"#{text_color}",  # Add # to text color
-                    wordlevel_info,
-                    str(clip_output_dir)
-                )
-                
-                if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                    return output_path
-                else:
-                    # Fallback to direct FFmpeg subtitle rendering
-                    return await self.ffmpeg_subtitle_fallback(video_path, wordlevel_info, f"{clip_basename}_{clip_index}")
-                    
-            except Exception as e:
-                print(f"⚠️ Error adding subtitles with movie.py: {e}")
-                return await self.ffmpeg_subtitle_fallback(video_path, wordlevel_info, f"{clip_basename}_{clip_index}")
-                
-        except Exception as e:
-            print(f"⚠️ Error processing subtitles: {e}")
-            return video_path
+    async def probe_all(self, video_paths):
+        """Probe several videos concurrently; returns one info dict (or None on failure) per path"""
+        results = await asyncio.gather(*(self.probe_video(path) for path in video_paths), return_exceptions=True)
+        infos = []
+        for path, result in zip(video_paths, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Could not probe {path}: {result}")
+                result = None
+            infos.append(result)
+        return infos
 
-    async def ffmpeg_subtitle_fallback(self, video_path, wordlevel_info, clip_basename):
-        """Fallback method to add subtitles using FFmpeg directly with selected style"""
-        print(f"Using FFmpeg fallback for subtitles with style: {self.subtitle_style}")
-        
-        # Get style configuration
-        style_config = SUBTITLE_STYLES.get(self.subtitle_style, SUBTITLE_STYLES["default"])
-        
-        # Extract style parameters
-        font_size = style_config.get("font_size", 24)
-        text_color = style_config.get("text_color", "FFFF00")
-        use_outline = style_config.get("use_outline", True)
-        outline_color = style_config.get("outline_color", "000000") if use_outline else None
-        
-        # Create subtitle file
-        subtitle_file = self.temp_dir / f"subs_{clip_basename}.srt"
-        with open(subtitle_file, 'w') as f:
-            for i, word in enumerate(wordlevel_info):
-                f.write(f"{i+1}\n")
-                start_time = self.format_srt_time(word["start"])
-                end_time = self.format_srt_time(word["end"])
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{word['word']}\n\n")
-                
-        # Convert hex color to ffmpeg subtitle format (BBGGRR)
-        r, g, b = tuple(int(text_color[i:i+2], 16) for i in (0, 2, 4))
-        ffmpeg_color = f"&H{b:02X}{g:02X}{r:02X}&"
-        
-        # Convert outline color if needed
-        if use_outline and outline_color:
-            or_, og, ob = tuple(int(outline_color[i:i+2], 16) for i in (0, 2, 4))
-            outline_ffmpeg_color = f"&H{ob:02X}{og:02X}{or_:02X}&"
-            border_style = "3"  # Outlined and shadowed
-        else:
-            outline_ffmpeg_color = "&H000000&"  # Black
-            border_style = "1"  # No outline
-        
-        # Add subtitles with FFmpeg - use unique output name
-        output_path = self.output_dir / f"subtitled_{clip_basename}.mp4"
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(video_path),
-            "-vf", f"subtitles={subtitle_file}:force_style='FontSize={font_size*2},PrimaryColour={ffmpeg_color},OutlineColour={outline_ffmpeg_color},BorderStyle={border_style}'",
-            "-c:v", "libx264", "-crf", "23",
-            "-c:a", "copy",
-            str(output_path)
-        ]
-        
-        try:
-            async with self.ffmpeg_semaphore:
-                await self.run_subprocess(cmd)
-            return str(output_path)
-        except Exception as e:
-            print(f"⚠️ FFmpeg subtitle fallback failed: {e}")
-            return video_path
+    async def get_video_dimensions(self, video_path):
+        """Get the (width, height) of the first video stream asynchronously"""
+        info = await self.probe_video(video_path)
+        return info["width"], info["height"]
 
-    def format_srt_time(self, seconds):
-        """Format time in SRT format (HH:MM:SS,mmm)"""
-        hours = int(seconds / 3600)
-        minutes = int((seconds % 3600) / 60)
-        secs = seconds % 60
-        milliseconds = int((secs - int(secs)) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{int(secs):02d},{milliseconds:03d}"
+    async def get_video_duration(self, video_path):
+        """Get the duration of a video asynchronously"""
+        info = await self.probe_video(video_path)
+        return info["duration"]
 
     async def optimize_video(self, video_path, clip_index):
-        """Optimize video for web sharing with faster encoding"""
-        clip_basename = Path(video_path).stem
+        """Optimize video for web sharing by moving the moov atom to the front
+        
+        The streams are already encoded, so this is a stream-copy remux rather than a re-encode,
+        and a file that is already faststart (e.g. a stepwise stack with no subtitles) is just moved into place.
+        video_path is consumed either way.
+        """
         # Ensure unique output filename using clip_index
         output_path = self.output_dir / f"optimized_brainrot_highlight_{clip_index}.mp4"
         
+        if is_faststart(video_path):
+            try:
+                shutil.move(str(video_path), output_path)
+                return str(output_path)
+            except Exception as e:
+                print(f"⚠️ Error moving already-optimized video: {e}")
+        
         cmd = [
-            "ffmpeg", "-y", 
+            "ffmpeg", "-y", *FFMPEG_LOG_ARGS,
             "-i", str(video_path),
+            "-c", "copy",
             "-movflags", "+faststart",  # Optimize for web streaming
-            "-c:v", "libx264", "-crf", "24", "-preset", "veryfast",  # Faster encoding preset
-            "-tune", "fastdecode",  # Optimize for decoding speed
-            "-c:a", "aac", "-b:a", "128k",  # Reduced audio bitrate
-            # Add thread count for parallel encoding
-            "-threads", str(min(os.cpu_count() or 4, 8)),
             str(output_path)
         ]
         
         try:
-            async with self.ffmpeg_semaphore:
-                await self.run_subprocess(cmd)
+            await self.run_subprocess(cmd, timeout=FORMAT_TIMEOUT)
             if output_path.exists() and output_path.stat().st_size > 0:
                 return str(output_path)
         except Exception as e:
             print(f"⚠️ Error optimizing video: {e}")
         
-        # If optimization fails, copy the original to the output with unique name
+        # If optimization fails, move the original to the output with unique name
         fallback_path = self.output_dir / f"brainrot_highlight_{clip_index}.mp4"
         try:
-            import shutil
-            shutil.copy2(video_path, fallback_path)
+            shutil.move(str(video_path), fallback_path)
             return str(fallback_path)
         except Exception as e:
             print(f"⚠️ Error copying video: {e}")
             return video_path
 
-    async def process_highlight_clip(self, highlight_clip, background_video, whisper_model, clip_index):
-        """Process a single highlight clip with improved robustness and parallelism"""
+    async def render_final_clip(self, highlight_clip, background_clip, wordlevel_info, source_size, clip_index, background_start=0, audio_codec=None):
+        """Render the final 1080x1920 clip from the raw highlight in a single FFmpeg pass
+        
+        Scaling, the separator strip, stacking over the background and burning in
+        the subtitles all happen in one filter graph, so the clip is decoded and
+        encoded once instead of once per step. background_start seeks into the
+        background input, so a prebuilt background is read in place. The result goes
+        to the temp dir; finalize_clip does the faststart remux into the output dir.
+        audio_codec is the highlight's probed audio codec (None when it has no audio).
+        """
+        target_width, target_height = 1080, 1920
+        top_height = self.get_top_section_height(*source_size, target_width=target_width)
+        bottom_height = target_height - top_height - SEPARATOR_HEIGHT
+        
+        subtitle_file = None
+        if wordlevel_info:
+            subtitle_file = self.clip_temp_dir(clip_index) / f"subs_{clip_index}.ass"
+            await asyncio.to_thread(self.write_ass_subtitles, subtitle_file, wordlevel_info, target_width, target_height)
+        subtitle_filter = f",ass={subtitle_file}" if subtitle_file else ""
+        
+        # The main clip is decoded and scaled on the GPU when NVENC and scale_cuda allow it;
+        # inputs the GPU can't take (10-bit, unsupported codecs) fail here and are
+        # re-rendered by the stepwise fallback, which scales on the CPU
+        top_input_args, top_scale = gpu_scale(target_width, top_height)
+        cmd = ["ffmpeg", "-y", *FFMPEG_LOG_ARGS, *top_input_args, "-i", str(highlight_clip)]
+        if background_clip and os.path.exists(background_clip):
+            # Loop the background input so it can never end before the main clip
+            cmd.extend([*hwaccel_decode_args(), "-ss", f"{background_start:.2f}", "-stream_loop", "-1", "-i", str(background_clip)])
+            filter_graph = (
+                f"[0:v]{top_scale},setsar=1[top];"
+                f"color=c={SEPARATOR_COLOR}:s={target_width}x{SEPARATOR_HEIGHT}:r=30[gap];"
+                f"[1:v]scale={target_width}:{bottom_height}:force_original_aspect_ratio=increase,"
+                f"crop={target_width}:{bottom_height},setsar=1[bottom];"
+                f"[top][gap][bottom]vstack=inputs=3:shortest=1{subtitle_filter}[v]"
+            )
+        else:
+            filter_graph = (
+                f"[0:v]{top_scale},setsar=1,"
+                f"pad={target_width}:{target_height}:0:0:color=black{subtitle_filter}[v]"
+            )
+        
+        output_path = self.clip_temp_dir(clip_index) / f"rendered_highlight_{clip_index}.mp4"
+        cmd.extend([
+            "-filter_complex", filter_graph,
+            "-map", "[v]",
+            "-map", "0:a?",
+            *h264_encoder_args(crf=self.crf, preset="veryfast", tune="fastdecode"),
+            # Pass AAC/MP3 audio through rather than adding another lossy generation; anything
+            # else (e.g. Opus or Vorbis from a raw yt-dlp merge) is re-encoded for MP4
+            *(["-c:a", "copy"] if audio_codec in MP4_COPY_AUDIO_CODECS or audio_codec is None else ["-c:a", "aac", "-b:a", "192k"]),
+            str(output_path)
+        ])
+        
+        returncode, _, stderr = await self._run_ffmpeg_with_semaphore(cmd, timeout=RENDER_TIMEOUT)
+        if returncode == 0 and output_path.exists() and output_path.stat().st_size > 0:
+            return str(output_path)
+        
+        error_msg = stderr.decode(errors="replace")[-500:] if stderr else "Unknown error"
+        print(f"⚠️ Single-pass render failed for clip {clip_index+1}: {error_msg}")
+        return None
+
+    async def render_clip_stepwise(self, highlight_clip, background_clip, wordlevel_info, duration, clip_index, background_start=0, source_size=None):
+        """Fallback renderer: stack and subtitle as separate FFmpeg passes"""
+        # stack_videos_async scales the raw highlight itself, so no mobile pre-pass is needed
+        stacked_clip = await self.stack_videos_async(highlight_clip, background_clip, duration, clip_index, source_size, background_start)
+        if not stacked_clip:
+            print(f"❌ Failed to stack videos, skipping")
+            return None
+        
+        return await self.add_subtitles_efficient(stacked_clip, clip_index, wordlevel_info, size=(1080, 1920))
+
+    async def process_highlight_clip(self, highlight_clip, background_video, wordlevel_info, clip_index, clip_info=None):
+        """Render a single, already transcribed highlight clip and remux it into the output directory"""
+        rendered_clip = await self.render_highlight_clip(highlight_clip, background_video, wordlevel_info, clip_index, clip_info)
+        if not rendered_clip:
+            return None
+        return await self.finalize_clip(rendered_clip, clip_index)
+
+    async def render_highlight_clip(self, highlight_clip, background_video, wordlevel_info, clip_index, clip_info=None):
+        """Encode a single, already transcribed highlight clip with improved robustness and parallelism
+        
+        clip_info is the probe_video() result for highlight_clip, when already known.
+        Returns the rendered clip in the temp dir, before its faststart remux.
+        """
         try:
             print(f"\n--- Processing highlight clip {clip_index+1} ---")
             
-            # Step 1: Create all tasks for this clip at once 
-            # This allows for maximum utilization of resources in parallel
-            
-            # Format video for mobile (basic step that other tasks depend on)
             clip_name = f"highlight_{clip_index}"
-            mobile_clip = await self.format_for_mobile_async(highlight_clip, clip_index)
-            if not mobile_clip:
-                print(f"❌ Failed to format clip for mobile, skipping")
-                return None
             
-            # Get duration (needed for background)
-            duration = await self.get_video_duration(mobile_clip)
-            
-            # Create all independent tasks in parallel:
-            # 1. Extract audio & transcribe
-            # 2. Prepare background video
-            # We can't optimize more than this without restructuring the dependency graph
-            
-            # Create and start all tasks concurrently using gather for compatibility
-            audio_task = self._extract_audio(mobile_clip)
-            background_task = self.prepare_background_async(background_video, duration, f"{clip_name}_{clip_index}")
-            
-            # Run tasks in parallel
-            audio_path, background_result = await asyncio.gather(audio_task, background_task)
-            
-            # Process results for audio extraction
-            wordlevel_info = [{"word": "NO TRANSCRIPTION", "start": 0.0, "end": 5.0}]
-            if audio_path:
+            # The raw highlight feeds the single-pass render directly, so only its
+            # size and duration are needed up front
+            if clip_info is None:
                 try:
-                    # Optimize transcription with shorter timeout and parallelized processing
-                    wordlevel_info = await self._transcribe_audio(whisper_model, audio_path)
-                    print(f"✅ Transcription complete with {len(wordlevel_info)} words")
-                except Exception as e:
-                    print(f"⚠️ Transcription exception: {e}")
-                    wordlevel_info = [{"word": "TRANSCRIPTION ERROR", "start": 0.0, "end": 5.0}]
-            
-            # Process results for background
-            background_clip, use_background = background_result if background_result else (None, False)
-            
-            # Steps that must be done sequentially after formatting, audio extraction, and background preparation:
-            # 1. Stack videos
-            # 2. Add subtitles 
-            # 3. Optimize final video
+                    clip_info = await asyncio.wait_for(self.probe_video(highlight_clip), timeout=PROBE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    print(f"⚠️ Probing clip {clip_index+1} timed out after {PROBE_TIMEOUT}s, skipping it")
+                    return None
+            source_size = (clip_info["width"], clip_info["height"])
+            duration = clip_info["duration"]
             
-            # Stack videos
-            print(f"\n=== STEP 4: STACKING VIDEOS (Clip {clip_index+1}) ===")
-            stacked_clip = await self.stack_videos_async(mobile_clip, background_clip if use_background else None, duration)
-            if not stacked_clip:
-                print(f"❌ Failed to stack videos, using mobile clip")
-                stacked_clip = mobile_clip
+            # The transcript was produced by iter_transcriptions before this clip was queued
+            # A background encode that overruns FORMAT_TIMEOUT is killed and the clip renders without one
+            background_result = await self.prepare_background_async(background_video, duration, f"{clip_name}_{clip_index}")
             
-            # Add subtitles (depends on stacked video)
-            print(f"\n=== STEP 5: ADDING SUBTITLES (Clip {clip_index+1}) ===")
-            subtitled_clip = await self.add_subtitles_efficient(stacked_clip, clip_index, wordlevel_info)
-            
-            # Final optimization (depends on subtitled video)
-            print(f"\n=== STEP 6: OPTIMIZING (Clip {clip_index+1}) ===")
-            final_clip = await self.optimize_video(subtitled_clip, clip_index)
+            # Process results for background
+            background_clip, use_background, background_start = background_result if background_result else (None, False, 0)
+            if not use_background:
+                background_clip = None
+            
+            # Stack, subtitle and optimize in one pass
+            print(f"\n=== STEP 4: RENDERING FINAL CLIP (Clip {clip_index+1}) ===")
+            await self.report_progress("step", step=4, highlight=clip_index + 1, description="Rendering final clip")
+            final_clip = await self.render_final_clip(
+                highlight_clip, background_clip, wordlevel_info, source_size, clip_index, background_start,
+                audio_codec=clip_info.get("audio_codec")
+            )
+            if not final_clip:
+                print(f"⚠️ Falling back to step-by-step rendering for clip {clip_index+1}")
+                final_clip = await self.render_clip_stepwise(highlight_clip, background_clip, wordlevel_info, duration, clip_index, background_start, source_size)
             
-            print(f"✅ Completed processing for clip {clip_index+1}: {final_clip}")
             return final_clip
             
         except Exception as e:
@@ -643,95 +834,53 @@ class BrainrotWorkflow:
             import traceback
             traceback.print_exc()
             return None
-            
-    async def add_subtitles_efficient(self, video_path, clip_index, wordlevel_info):
-        """More efficient subtitle addition using direct FFmpeg rendering with centered positioning"""
+
+    async def finalize_clip(self, rendered_clip, clip_index):
+        """Faststart-remux a rendered clip into the output directory and report it as completed
+        
+        The remux is a stream copy, so render workers hand it off and move on to their next encode.
+        The finished clip is announced with a clip_ready event straight away, and its
+        intermediates are deleted rather than left for the end-of-run cleanup.
+        """
+        final_clip = await self.optimize_video(rendered_clip, clip_index)
+        print(f"✅ Completed processing for clip {clip_index+1}: {final_clip}")
+        await self.report_progress("completed", highlight=clip_index + 1)
+        if final_clip and Path(final_clip).parent == self.output_dir:
+            await self.report_progress("clip_ready", highlight=clip_index + 1, path=str(final_clip))
+            shutil.rmtree(self.temp_dir / f"highlight_{clip_index}", ignore_errors=True)
+        return final_clip
+            
+    async def add_subtitles_efficient(self, video_path, clip_index, wordlevel_info, size=None):
+        """More efficient subtitle addition using direct FFmpeg rendering with centered positioning
+        
+        size is video_path's (width, height), when already known.
+        """
         if not wordlevel_info:
             print(f"⚠️ No transcription data for clip {clip_index}")
             return video_path
             
         try:
-            # Get style configuration
-            style_config = SUBTITLE_STYLES.get(self.subtitle_style, SUBTITLE_STYLES["default"])
-            
-            # Extract style parameters
-            font_size = style_config.get("font_size", 24)
-            text_color = style_config.get("text_color", "FFFF00")
-            use_outline = style_config.get("use_outline", True)
-            outline_color = style_config.get("outline_color", "000000") if use_outline else None
-            
             # Create subtitle file directly as SSA/ASS format
-            subtitle_file = self.temp_dir / f"subs_{clip_index}.ass"
+            subtitle_file = self.clip_temp_dir(clip_index) / f"subs_{clip_index}.ass"
             
             # Calculate video dimensions for proper positioning
-            probe_cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=width,height", 
-                "-of", "csv=p=0", 
-                str(video_path)
-            ]
+            width, height = size or await self.get_video_dimensions(video_path)
             
-            async with self.ffmpeg_semaphore:
-                _, stdout, _ = await self.run_subprocess(probe_cmd)
-            
-            width, height = map(int, stdout.decode().strip().split(','))
-            
-            # Create the ASS subtitle file with styling
-            with open(subtitle_file, 'w', encoding='utf-8') as f:
-                # Write header
-                f.write("[Script Info]\n")
-                f.write(f"PlayResX: {width}\n")
-                f.write(f"PlayResY: {height}\n")
-                f.write("ScaledBorderAndShadow: yes\n\n")
-                
-                # Write styles - CENTER ALIGNMENT IS KEY HERE
-                f.write("[V4+ Styles]\n")
-                f.write("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n")
-                
-                # Convert hex colors to ASS format (AABBGGRR)
-                primary_color = f"&H00{text_color[4:6]}{text_color[2:4]}{text_color[0:2]}&"
-                outline_col = f"&H00{outline_color[4:6]}{outline_color[2:4]}{outline_color[0:2]}&" if outline_color else "&H000000&"
-                
-                # Create style line
-                bold = 1 if style_config.get("bold", False) else 0
-                outline_size = 1 if use_outline else 0
-                shadow = 1 if use_outline else 0
-                
-                # Position in the MIDDLE - Alignment 5 = center middle of screen
-                # Change from alignment 8 (top center) to 5 (middle center)
-                # Adjust vertical position to be in middle of top portion
-                top_section_height = int(height * 0.4)  # Top 40% of video
-                margin_v = int(top_section_height * 0.5)  # Center within top section
-                
-                f.write(f"Style: Default,Arial,{font_size*2},{primary_color},&H00FFFFFF&,{outline_col},&H80000000&,{bold},0,0,0,100,100,0,0,1,{outline_size},{shadow},5,30,30,{margin_v},1\n\n")
-                
-                # Write events
-                f.write("[Events]\n")
-                f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
-                
-                # Add each word as an event
-                for i, word in enumerate(wordlevel_info):
-                    start_time = self.format_ass_time(word["start"])
-                    end_time = self.format_ass_time(word["end"])
-                    text = word["word"].strip()
-                    if text:  # Only add non-empty words
-                        f.write(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n")
+            await asyncio.to_thread(self.write_ass_subtitles, subtitle_file, wordlevel_info, width, height)
             
             # Add subtitles with FFmpeg - use unique output name
-            output_path = self.temp_dir / f"subtitled_efficient_{clip_index}.mp4"
+            output_path = self.clip_temp_dir(clip_index) / f"subtitled_efficient_{clip_index}.mp4"
             cmd = [
-                "ffmpeg", "-y",
-                "-i", str(video_path),
+                "ffmpeg", "-y", *FFMPEG_LOG_ARGS,
+                *hwaccel_decode_args(), "-i", str(video_path),
                 "-vf", f"ass={subtitle_file}",
-                "-c:v", "libx264", "-crf", "23", "-preset", "faster",
+                *h264_encoder_args(crf=self.crf, preset="veryfast"),
                 "-c:a", "copy",
                 str(output_path)
             ]
             
             async with self.ffmpeg_semaphore:
-                await self.run_subprocess(cmd)
+                await self.run_subprocess(cmd, timeout=RENDER_TIMEOUT)
                 
             if output_path.exists() and output_path.stat().st_size > 0:
                 return str(output_path)
@@ -743,16 +892,27 @@ class BrainrotWorkflow:
             print(f"⚠️ Error adding subtitles efficiently: {e}")
             return video_path
             
+    def set_subtitle_config(self, style_config):
+        """Use style_config for this workflow's subtitles, compiling its ASS style once"""
+        self.style_config = style_config
+        self.ass_style = compile_ass_style(style_config)
+
+    def write_ass_subtitles(self, subtitle_file, wordlevel_info, width, height):
+        """Write word-level subtitles as a styled ASS file for a width x height frame"""
+        ass = words_to_ass(wordlevel_info, self.style_config, width, height, ass_style=self.ass_style)
+        Path(subtitle_file).write_text(ass, encoding='utf-8')
+        return subtitle_file
+
     def format_ass_time(self, seconds):
         """Format time in ASS format (H:MM:SS.cc)"""
-        hours = int(seconds / 3600)
-        minutes = int((seconds % 3600) / 60)
-        secs = seconds % 60
-        centisecs = int((secs - int(secs)) * 100)
-        return f"{hours}:{minutes:02d}:{int(secs):02d}.{centisecs:02d}"
+        return format_ass_time(seconds)
 
     async def prepare_background_async(self, background_video, duration, clip_name):
-        """Prepare background video asynchronously with truly random selection for each clip"""
+        """Prepare background video asynchronously with truly random selection for each clip
+        
+        Returns (background_clip, use_background, start_time); start_time is where
+        the clip's window begins inside background_clip.
+        """
         try:
             # For dynamic background mode, select a new random background for each clip
             if hasattr(self, 'use_dynamic_background') and self.use_dynamic_background:
@@ -774,10 +934,18 @@ class BrainrotWorkflow:
             
             if not background_video or not os.path.exists(background_video):
                 print(f"⚠️ No valid background video for clip {clip_name}")
-                return None, False
+                return None, False, 0
             
             bg_filename = f"bg_{clip_name}.mp4"
             
+            # Use a random window of the run's prebuilt background in place; the render
+            # seeks into it, so there is no per-clip encode or copy of the background
+            if background_video in self.prebuilt_backgrounds:
+                prebuilt_clip, prebuilt_duration = self.prebuilt_backgrounds[background_video]
+                window_start = random.uniform(0, max(0, prebuilt_duration - duration))
+                print(f"🎲 Using background window at {window_start:.2f}s of {Path(prebuilt_clip).name}")
+                return prebuilt_clip, True, window_start
+            
             # Get video duration for random starting point
             try:
                 video_duration = await self.get_video_duration(background_video)
@@ -792,35 +960,94 @@ class BrainrotWorkflow:
                 start_time = random.uniform(0, max_start)
                 print(f"🎲 Starting background at {start_time:.2f}s (of {video_duration:.2f}s)")
             
-            # Use thread pool for more efficient processing
-            background_clip = await asyncio.to_thread(
-                self.formatter.loop_subway_surfers,
-                background_video,
-                duration,
-                bg_filename,
-                start_time
-            )
+            background_clip = await self.loop_background_async(background_video, duration, bg_filename, start_time)
             
             if background_clip and os.path.exists(background_clip):
                 print(f"✅ Prepared background video: {background_clip}")
-                return background_clip, True
+                return background_clip, True, 0
                 
         except Exception as e:
             print(f"⚠️ Error preparing background: {e}")
             import traceback
             traceback.print_exc()
             
-        return None, False
+        return None, False, 0
+
+    async def loop_background_async(self, background_video, duration, output_filename, start_time):
+        """Encode a scaled, cropped background segment (see VideoFormatter.loop_subway_surfers)
+        
+        The encode shares the FFmpeg semaphore with the renders and is killed once it
+        runs past FORMAT_TIMEOUT. Returns the output path; raises if FFmpeg fails.
+        """
+        size = await self.get_video_dimensions(background_video)
+        cmd, output_path = self.formatter.loop_subway_surfers_command(
+            background_video, duration, output_filename, start_time, size=size
+        )
+        async with self.ffmpeg_semaphore:
+            await self.run_subprocess(cmd, timeout=FORMAT_TIMEOUT)
+        return output_path
+
+    async def prebuild_backgrounds(self, background_video, clip_durations):
+        """Transcode each background source once per run into a scaled, cropped loop
+        
+        Every clip then reads a window of it instead of running its own scale/crop
+        encode of the source.
+        """
+        if getattr(self, "use_dynamic_background", False) and getattr(self, "background_videos", None):
+            # No point preparing more backgrounds than there are clips to use them
+            sources = random.sample(self.background_videos, min(len(self.background_videos), len(clip_durations)))
+            self.background_videos = sources
+        elif background_video:
+            sources = [background_video]
+        else:
+            return
+        
+        # Long enough for the longest clip plus a window of random start points
+        prebuilt_duration = max(clip_durations) + BACKGROUND_START_WINDOW
+        
+        async def prebuild(source):
+            try:
+                source_duration = await self.get_video_duration(source)
+            except Exception as e:
+                print(f"⚠️ Unable to get background video duration: {e}")
+                source_duration = None
+            
+            start_time = 0
+            segment_duration = prebuilt_duration
+            if source_duration:
+                segment_duration = min(prebuilt_duration, source_duration)
+                if source_duration > prebuilt_duration + 5:
+                    start_time = random.uniform(0, source_duration - prebuilt_duration - 5)
+            
+            try:
+                prebuilt_clip = await self.loop_background_async(
+                    source, segment_duration, f"prebuilt_bg_{Path(source).stem}.mp4", start_time
+                )
+            except Exception as e:
+                print(f"⚠️ Error prebuilding background from {Path(source).name}: {e}")
+                return
+            if prebuilt_clip and os.path.exists(prebuilt_clip):
+                self.prebuilt_backgrounds[source] = (str(prebuilt_clip), segment_duration)
+                print(f"✅ Prebuilt background from {Path(source).name} ({segment_duration:.1f}s)")
+        
+        await asyncio.gather(*(prebuild(source) for source in sources))
+        
+        # Dynamic clips pick among the sources that did prebuild, so a failed one doesn't
+        # send every clip that draws it back to a per-clip background encode
+        prebuilt_sources = [source for source in sources if source in self.prebuilt_backgrounds]
+        if getattr(self, "use_dynamic_background", False) and prebuilt_sources:
+            self.background_videos = prebuilt_sources
 
     async def process_video(self, url, subway_video_path=None, subtitle_config=None, use_dynamic_background=False):
         """Process a video through the complete Brainrot workflow"""
         start_time = time.time()
         final_outputs = []
+        resource_tasks = []
         
         try:
             # Apply custom subtitle config if provided
             if subtitle_config:
-                SUBTITLE_STYLES[self.subtitle_style] = subtitle_config
+                self.set_subtitle_config(subtitle_config)
                 print(f"Applied custom subtitle configuration to style: {self.subtitle_style}")
             
             # Set dynamic background flag if either parameter indicates it
@@ -828,73 +1055,93 @@ class BrainrotWorkflow:
                 use_dynamic_background = True
                 print("🎲 Dynamic background mode enabled")
             
+            # Shared resources don't depend on the source video, so load the model and
+            # find the background while the video downloads and highlights are cut
+            resource_tasks = [
+                asyncio.create_task(self._load_whisper_model_async("small")),
+                asyncio.create_task(self.find_background_video(subway_video_path, use_dynamic_background))
+            ]
+            
             # Step 1: Download video
+            await self.report_progress("stage", name="Downloading", pct=10)
             input_video = await self.download_video(url)
             
             # Step 2: Extract highlights
+            await self.report_progress("stage", name="Extracting highlights", pct=20)
             highlight_clips = await self.extract_highlights(input_video)
+            await self.report_progress("total", count=len(highlight_clips))
             
-            # Create more aggressively parallel batch processing
-            cpu_count = os.cpu_count() or 4
-            optimal_batch_size = max(3, min(cpu_count + 2, 8))  # More aggressive batching: CPU count + 2, up to 8
+            # One render worker per encode slot, so concurrent encodes don't
+            # oversubscribe the CPU and thrash each other's caches
+            worker_count = max(1, min(self.encode_concurrency, len(highlight_clips)))
             
             print(f"Processing {len(highlight_clips)} clips with optimized parallelism...")
             
-            # Step 3: Pre-load resources in parallel that will be shared across all clips
+            # Step 3: Collect the shared resources started at the beginning of the run
             print("\n=== PREPARING SHARED RESOURCES ===")
+            await self.report_progress("stage", name="Preparing shared resources", pct=30)
+            model_task, background_task = resource_tasks
+            background_video = await background_task
+            
+            # Probe every clip once up front; the results feed both the background
+            # prebuild and each clip's render
+            clip_infos = await self.probe_all(highlight_clips)
+            
+            # Start encoding the background once for the whole run (long enough for the longest clip);
+            # it only needs the probes, so it runs while the Whisper model may still be loading
+            clip_durations = [info["duration"] for info in clip_infos if info]
+            prebuild_task = asyncio.create_task(
+                self.prebuild_backgrounds(background_video, clip_durations) if clip_durations else asyncio.sleep(0)
+            )
+            resource_tasks.append(prebuild_task)  # Cancelled with the others if the run fails
+            whisper_model = await model_task
             
-            # Load model and find background concurrently
-            resource_tasks = [
-                self._load_whisper_model_async("small"),
-                self.find_background_video(subway_video_path, use_dynamic_background)
-            ]
-            whisper_model, background_video = await asyncio.gather(*resource_tasks)
-            
-            print(f"Using batch size of {optimal_batch_size} for maximum throughput")
-            
-            # Process all clips with improved scheduling
-            all_tasks = []
-            for i, clip in enumerate(highlight_clips):
-                task = self.process_highlight_clip(clip, background_video, whisper_model, i)
-                all_tasks.append(task)
-            
-            # Use dynamic batch scheduling for better load balancing
-            results = []
-            if len(all_tasks) > 3:  # If we have more than 3 clips
-                # Process initial batch immediately to maximize utilization
-                first_batch_size = min(optimal_batch_size, len(all_tasks))
-                print(f"\n=== PROCESSING INITIAL BATCH (1/{(len(all_tasks) + optimal_batch_size - 1) // optimal_batch_size}) ===")
-                first_batch = all_tasks[:first_batch_size]
-                pending = all_tasks[first_batch_size:]
-                
-                # Start processing the first batch
-                batch_tasks = [asyncio.create_task(task) for task in first_batch]
-                
-                # As tasks complete, add new ones to maintain optimal concurrency
-                completed = []
-                while batch_tasks:
-                    # Wait for any task to complete
-                    done, batch_tasks = await asyncio.wait(
-                        batch_tasks, 
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Add completed tasks to results
-                    for task in done:
-                        result = task.result()
-                        if result:
-                            completed.append(result)
-                    
-                    # Add new tasks from pending list to maintain concurrency
-                    while pending and len(batch_tasks) < optimal_batch_size:
-                        next_task = pending.pop(0)
-                        batch_tasks.add(asyncio.create_task(next_task))
-                        print(f"Starting clip {len(completed) + len(batch_tasks)}/{len(all_tasks)}")
-                
-                results = completed
-            else:
-                # For small number of clips, process all at once
-                results = await asyncio.gather(*all_tasks, return_exceptions=True)
+            print(f"Using {worker_count} render workers")
+            await self.report_progress("stage", name="Creating clips", pct=40)
+            
+            # Transcription and rendering are pipelined: the transcriber feeds finished
+            # transcripts into the queue, so clip N renders on the CPU/encoder while
+            # Whisper works on clip N+1. A fixed pool of workers renders one clip at a time.
+            work_queue = asyncio.Queue()
+            results = [None] * len(highlight_clips)
+            # Faststart remuxes run alongside the next encodes instead of holding a render worker
+            finalize_tasks = {}
+            
+            async def transcriber():
+                try:
+                    async for i, wordlevel_info in self.iter_transcriptions(whisper_model, highlight_clips):
+                        await work_queue.put((i, wordlevel_info))
+                finally:
+                    # One sentinel per worker, even if transcription blew up
+                    for _ in range(worker_count):
+                        await work_queue.put(None)
+            
+            async def render_worker():
+                # Renders read the prebuilt background, so wait for it first; if the
+                # prebuild failed, clips fall back to encoding their own background
+                try:
+                    await prebuild_task
+                except Exception as e:
+                    print(f"⚠️ Background prebuild failed: {e}")
+                while True:
+                    item = await work_queue.get()
+                    if item is None:
+                        return
+                    i, wordlevel_info = item
+                    print(f"Starting clip {i+1}/{len(highlight_clips)}")
+                    try:
+                        rendered_clip = await self.render_highlight_clip(highlight_clips[i], background_video, wordlevel_info, i, clip_infos[i])
+                    except Exception as e:
+                        results[i] = e
+                        continue
+                    if rendered_clip:
+                        finalize_tasks[i] = asyncio.create_task(self.finalize_clip(rendered_clip, i))
+            
+            await asyncio.gather(transcriber(), *(render_worker() for _ in range(worker_count)))
+            
+            finalized = await asyncio.gather(*finalize_tasks.values(), return_exceptions=True)
+            for i, result in zip(finalize_tasks.keys(), finalized):
+                results[i] = result
             
             # Process results
             for i, result in enumerate(results):
@@ -903,9 +1150,7 @@ class BrainrotWorkflow:
                 elif result:
                     final_outputs.append(result)
             
-            # Clean up temporary files
-            print("\n=== CLEANING UP TEMPORARY FILES ===")
-            await self._cleanup_temp_files()
+            await self.report_progress("stage", name="Cleaning up", pct=95)
             
             total_time = time.time() - start_time
             clips_per_minute = len(final_outputs) / (total_time / 60) if total_time > 0 else 0
@@ -921,29 +1166,106 @@ class BrainrotWorkflow:
             print(f"❌ Error in main workflow: {e}")
             import traceback
             traceback.print_exc()
+            # Don't leave the early resource tasks running (or their errors unretrieved)
+            for task in resource_tasks:
+                task.cancel()
             return final_outputs
+        finally:
+            # Failed runs clean up too; a tmpfs temp dir would otherwise hold RAM until
+            # the worker process exits
+            print("\n=== CLEANING UP TEMPORARY FILES ===")
+            await self._cleanup_temp_files()
 
     async def _load_whisper_model_async(self, model_size):
         """Load whisper model asynchronously without trying to await the model itself"""
-        # Use asyncio.to_thread to load the model in a thread
-        return await asyncio.to_thread(load_whisper_model, model_size)
+        # Reuse a preloaded model when one was passed in
+        if self.whisper_model is not None:
+            return self.whisper_model
+        # Load the model on the Whisper thread, warming it up there too so the one-off
+        # initialization cost lands here and not on the first clip
+        loop = asyncio.get_running_loop()
+        self.whisper_model = await loop.run_in_executor(
+            TRANSCRIBE_POOL, lambda: warm_up_whisper_model(load_whisper_model(model_size, num_workers=WHISPER_WORKERS))
+        )
+        return self.whisper_model
 
     async def _cleanup_temp_files(self):
         """Clean up temporary files to save disk space"""
         try:
-            import shutil
+            # A tmpfs temp dir belongs to this run alone and holds RAM, so drop all of it
+            if self.temp_dir_is_tmpfs:
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                self.temp_dir.mkdir(exist_ok=True)  # Keep the workflow usable for another run
+                print("✅ Temporary files cleaned up")
+                return
             # Only remove files with certain patterns
-            for pattern in ['*.mp4', '*.wav', '*.ass', '*.srt']:
+            for pattern in ['*.mp4', '*.ass']:
                 for file in self.temp_dir.glob(pattern):
                     if file.is_file() and not file.name.startswith('optimized_'):
                         try:
                             os.remove(file)
                         except:
                             pass
+            # Per-clip folders left behind by clips that failed before finalize_clip
+            for clip_dir in self.temp_dir.glob('highlight_*'):
+                if clip_dir.is_dir():
+                    shutil.rmtree(clip_dir, ignore_errors=True)
             print("✅ Temporary files cleaned up")
         except Exception as e:
             print(f"⚠️ Error cleaning up temporary files: {e}")
 
+# Per-process state reused by run_workflow_job across jobs in the same worker process
+_worker_loop = None
+_worker_whisper_model = None
+
+def run_workflow_job(url, output_dir, background_video=None, progress_queue=None, use_dynamic=False, config=None):
+    """Run the complete workflow synchronously, e.g. inside a ProcessPoolExecutor worker
+    
+    Progress events are pushed onto progress_queue (a multiprocessing Manager queue)
+    so the caller can render them from another process. The event loop and the
+    Whisper model are kept for the lifetime of the worker process.
+    """
+    global _worker_loop, _worker_whisper_model
+    config = config or {}
+    
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    
+    if _worker_whisper_model is None:
+        try:
+            _worker_whisper_model = TRANSCRIBE_POOL.submit(
+                lambda: warm_up_whisper_model(load_whisper_model("small", num_workers=WHISPER_WORKERS))
+            ).result()
+        except Exception as e:
+            print(f"⚠️ Could not preload Whisper model: {e}")
+    
+    try:
+        workflow = BrainrotWorkflow(
+            output_dir=output_dir,
+            subtitle_style=config.get("subtitle_style", "default"),
+            progress_queue=progress_queue,
+            whisper_model=_worker_whisper_model,
+            crf=config.get("crf_value", 23)
+        )
+        
+        # Configure highlight extraction parameters
+        workflow.highlight_extractor.min_clip_duration = config.get("min_clip_duration", 10)
+        workflow.highlight_extractor.max_clip_duration = config.get("max_clip_duration", 40)
+        workflow.highlight_extractor.silent_threshold = config.get("silent_threshold", 0.04)
+        
+        return _worker_loop.run_until_complete(workflow.process_video(
+            url,
+            background_video,
+            config.get("subtitle_config"),
+            use_dynamic_background=use_dynamic
+        ))
+    except Exception as e:
+        print(f"Error in workflow: {e}")
+        if progress_queue is not None:
+            progress_queue.put({"type": "error", "error": str(e)})
+        return []
+
 async def main():
     parser = argparse.ArgumentParser(description="Brainrot Video Workflow")
     parser.add_argument("--url", required=True, help="YouTube URL to download and process")
@@ -7,6 +7,17 @@ import shutil
 import random
 from pathlib import Path
 
+from video_formatter import INTERMEDIATE_ENCODE, h264_encoder_args
+
+def link_or_copy(src, dst):
+    """Hard-link src to dst, replacing dst; copy instead when they are on different filesystems"""
+    try:
+        if os.path.lexists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 class HighlightExtractor:
     """Module responsible for extracting multiple highlight clips from videos using Auto-Editor and active segment detection."""
     
@@ -94,9 +105,9 @@ class HighlightExtractor:
         if video_duration <= self.min_clip_duration:
             print(f"Video too short ({video_duration:.2f}s). Using entire video.")
             output_path = self.highlights_dir / f"highlight_{video_id}_1.mp4"
-            shutil.copy2(input_video, output_path)
+            link_or_copy(input_video, output_path)
             main_output_path = self.output_dir / output_path.name
-            shutil.copy2(output_path, main_output_path)
+            link_or_copy(output_path, main_output_path)
             return [main_output_path]
         
         # Build auto-editor command using available options.
@@ -144,7 +155,7 @@ class HighlightExtractor:
                 output_clips = []
                 for clip in clips:
                     main_output_path = self.output_dir / clip.name
-                    shutil.copy2(clip, main_output_path)
+                    link_or_copy(clip, main_output_path)
                     output_clips.append(main_output_path)
                 return output_clips
             else:
@@ -225,18 +236,19 @@ class HighlightExtractor:
                     
                     output_filename = f"highlight_{video_id}_{index}.mp4"
                     output_path = self.highlights_dir / output_filename
+                    # -ss before -i seeks by keyframe instead of decoding from the start
                     cmd = [
                         "ffmpeg", "-y",
-                        "-i", str(input_video),
                         "-ss", str(current_pos),
+                        "-i", str(input_video),
                         "-t", str(target_duration),
-                        "-c:v", "libx264", "-crf", "22",
+                        *h264_encoder_args(**INTERMEDIATE_ENCODE),
                         "-c:a", "aac", "-b:a", "192k",
                         str(output_path)
                     ]
                     subprocess.run(cmd, check=True, capture_output=True)
                     main_output_path = self.output_dir / output_filename
-                    shutil.copy2(output_path, main_output_path)
+                    link_or_copy(output_path, main_output_path)
                     highlights.append(main_output_path)
                     index += 1
                     current_pos += target_duration
@@ -246,16 +258,16 @@ class HighlightExtractor:
                 duration = seg_duration
                 cmd = [
                     "ffmpeg", "-y",
-                    "-i", str(input_video),
                     "-ss", str(start),
+                    "-i", str(input_video),
                     "-t", str(duration),
-                    "-c:v", "libx264", "-crf", "22",
+                    *h264_encoder_args(**INTERMEDIATE_ENCODE),
                     "-c:a", "aac", "-b:a", "192k",
                     str(output_path)
                 ]
                 subprocess.run(cmd, check=True, capture_output=True)
                 main_output_path = self.output_dir / output_filename
-                shutil.copy2(output_path, main_output_path)
+                link_or_copy(output_path, main_output_path)
                 highlights.append(main_output_path)
                 index += 1
         print(f"Extracted {len(highlights)} clip(s) using active segment detection.")
@@ -281,9 +293,10 @@ class HighlightExtractor:
             print(f"Error in async highlight extraction: {e}")
             fallback_path = self.highlights_dir / f"highlight_fallback.mp4"
             try:
-                shutil.copy2(input_video, fallback_path)
                 main_output_path = self.output_dir / fallback_path.name
-                shutil.copy2(fallback_path, main_output_path)
+                # These fall back to whole-file copies across filesystems, so keep them off the event loop
+                await asyncio.to_thread(link_or_copy, input_video, fallback_path)
+                await asyncio.to_thread(link_or_copy, fallback_path, main_output_path)
                 return [main_output_path]
             except Exception as copy_error:
                 print(f"Error creating fallback clip: {copy_error}")
@@ -1,10 +1,17 @@
 import os
 import json
+import bisect
+import subprocess
 import ffmpeg
+import numpy as np
 from faster_whisper import WhisperModel
-from moviepy import VideoFileClip, TextClip, CompositeVideoClip, ColorClip
-from PIL import ImageFont
+try:
+    from faster_whisper import BatchedInferencePipeline  # faster-whisper >= 1.1
+except ImportError:
+    BatchedInferencePipeline = None
+from PIL import ImageColor, ImageFont
 import requests
+from video_formatter import h264_encoder_args
 
 # Google Fonts to download and use
 GOOGLE_FONTS = {
@@ -113,84 +120,93 @@ def register_fonts():
 # Register fonts at module import time
 FONTS = register_fonts()
 
-def create_audio(videofilename):
-    """Extract audio from video file"""
+def load_audio_array(videofilename, sample_rate=16000):
+    """Decode a video's audio into a mono float32 numpy array at Whisper's sample rate
+    
+    FFmpeg writes raw samples to a pipe, so nothing is written to disk; the array can
+    be passed to transcribe_audio in place of an audio file.
+    """
     try:
-        # Create audio filename from video filename - handle all possible extensions
-        base_name = os.path.splitext(videofilename)[0]
-        audiofilename = f"{base_name}.mp3"
-
-        # Check if source video exists and is readable
-        if not os.path.exists(videofilename):
-            print(f"Video file not found: {videofilename}")
+        result = subprocess.run([
+            "ffmpeg", "-v", "error",
+            "-i", videofilename,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "-f", "f32le",
+            "-"
+        ], capture_output=True, check=True)
+        audio = np.frombuffer(result.stdout, dtype=np.float32)
+        if audio.size == 0:
+            print(f"No audio decoded from: {videofilename}")
             return None
-            
-        # Skip extraction if audio file already exists
-        if os.path.exists(audiofilename) and os.path.getsize(audiofilename) > 0:
-            print(f"Using existing audio file: {audiofilename}")
-            return audiofilename
+        return audio
+    except Exception as e:
+        print(f"Error extracting audio: {e}")
+        return None
 
-        try:
-            # Try the ffmpeg-python library first
-            input_stream = ffmpeg.input(videofilename)
-            audio = input_stream.audio
-            output_stream = ffmpeg.output(audio, audiofilename)
-            output_stream = ffmpeg.overwrite_output(output_stream)
-            ffmpeg.run(output_stream, quiet=True)
-        except Exception as e:
-            print(f"Error with ffmpeg-python: {e}")
-            
-            # Fallback to using subprocess directly
-            print("Trying fallback audio extraction method...")
-            import subprocess
-            subprocess.run([
-                "ffmpeg", "-y",
-                "-i", videofilename,
-                "-q:a", "0", "-map", "a",
-                audiofilename
-            ], check=True)
-        
-        # Verify the extraction worked
-        if os.path.exists(audiofilename) and os.path.getsize(audiofilename) > 0:
-            print(f"Successfully extracted audio to: {audiofilename}")
-            return audiofilename
-        else:
-            print(f"Failed to extract audio (empty file): {audiofilename}")
-            return None
+def detect_language(whisper_model, audio, sample_rate=16000, min_probability=0.5):
+    """Return the language Whisper hears in the first 30 seconds of audio, or None
     
+    Only the language detection runs; the returned segments are never decoded. Passing
+    the result to later transcriptions of the same speaker skips their own detection pass.
+    None is also returned when Whisper is less than min_probability sure (music, silence),
+    so those transcriptions detect the language themselves.
+    """
+    model = whisper_model
+    if BatchedInferencePipeline is not None and isinstance(whisper_model, BatchedInferencePipeline):
+        model = whisper_model.model  # A plain WhisperModel's .model is the CTranslate2 model, not this
+    try:
+        _, info = model.transcribe(audio[:30 * sample_rate], beam_size=1)
+        if info.language_probability < min_probability:
+            print(f"Language detection unsure ({info.language} at {info.language_probability:.2f}), detecting per clip")
+            return None
+        return info.language
     except Exception as e:
-        print(f"Error extracting audio: {e}")
+        print(f"Language detection failed: {e}")
         return None
 
-def transcribe_audio(whisper_model, audiofilename):
-    """Transcribe audio file using Whisper model"""
+def transcribe_audio(whisper_model, audiofilename, batch_size=None, language=None):
+    """Transcribe audio file using Whisper model
+    
+    audiofilename may also be a 16 kHz mono float32 numpy array of samples.
+    Pass batch_size when whisper_model is a BatchedInferencePipeline, and language
+    when it is already known.
+    """
     try:
+        if isinstance(audiofilename, np.ndarray):
+            if audiofilename.size < 1600:  # 0.1s at 16 kHz
+                print(f"Audio too short ({audiofilename.size / 16000}s)")
+                return [{'word': 'TOO SHORT', 'start': 0.0, 'end': 1.0}]
         # Check if audio file exists
-        if not os.path.exists(audiofilename):
+        elif not os.path.exists(audiofilename):
             print(f"Audio file not found: {audiofilename}")
             return [{'word': 'AUDIO FILE NOT FOUND', 'start': 0.0, 'end': 2.0}]
             
         # Get audio duration to validate
-        try:
-            import subprocess
-            result = subprocess.run([
-                "ffprobe", "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                audiofilename
-            ], capture_output=True, text=True, check=True)
+        if not isinstance(audiofilename, np.ndarray):
+            try:
+                import subprocess
+                result = subprocess.run([
+                    "ffprobe", "-v", "error", 
+                    "-show_entries", "format=duration", 
+                    "-of", "default=noprint_wrappers=1:nokey=1", 
+                    audiofilename
+                ], capture_output=True, text=True, check=True)
             
-            duration = float(result.stdout.strip())
-            if duration < 0.1:
-                print(f"Audio file too short ({duration}s): {audiofilename}")
-                return [{'word': 'TOO SHORT', 'start': 0.0, 'end': 1.0}]
+                duration = float(result.stdout.strip())
+                if duration < 0.1:
+                    print(f"Audio file too short ({duration}s): {audiofilename}")
+                    return [{'word': 'TOO SHORT', 'start': 0.0, 'end': 1.0}]
                 
-        except Exception as duration_error:
-            print(f"Could not check audio duration: {duration_error}")
-            # Continue anyway
+            except Exception as duration_error:
+                print(f"Could not check audio duration: {duration_error}")
+                # Continue anyway
         
-        # Perform transcription with timeout handling
-        segments, info = whisper_model.transcribe(audiofilename, word_timestamps=True)
+        # Perform transcription with timeout handling; greedy decoding is plenty for
+        # subtitles and VAD skips silent stretches instead of decoding them
+        transcribe_kwargs = {"batch_size": batch_size} if batch_size else {}
+        segments, info = whisper_model.transcribe(audiofilename, language=language, word_timestamps=True, beam_size=1, vad_filter=True, **transcribe_kwargs)
 
         # The transcription will actually run here
         try:
@@ -199,19 +215,12 @@ def transcribe_audio(whisper_model, audiofilename):
             print(f"Error listing segments: {list_error}")
             return [{'word': 'TRANSCRIPTION ERROR', 'start': 0.0, 'end': 2.0}]
 
-        wordlevel_info = []
-
-        for segment in segments:
-            try:
-                for word in segment.words:
-                    wordlevel_info.append({
-                        'word': word.word.upper(), 
-                        'start': word.start, 
-                        'end': word.end
-                    })
-            except Exception as word_error:
-                print(f"Error processing words in segment: {word_error}")
-                continue
+        # Segments without word timings (words is None) contribute nothing
+        wordlevel_info = [
+            {'word': word.word.upper(), 'start': word.start, 'end': word.end}
+            for segment in segments
+            for word in (segment.words or [])
+        ]
 
         # If no words were transcribed, add a placeholder
         if not wordlevel_info:
@@ -223,6 +232,42 @@ def transcribe_audio(whisper_model, audiofilename):
         print(f"Transcription error: {e}")
         return [{'word': 'TRANSCRIPTION FAILED', 'start': 0.0, 'end': 2.0}]
 
+def transcribe_audio_batch(whisper_model, audios, batch_size=None, sample_rate=16000, gap_seconds=1.0, language=None):
+    """Transcribe several clips' audio in one Whisper call
+    
+    audios are 16 kHz mono float32 arrays. They are concatenated with short silences
+    between them, so a BatchedInferencePipeline fills each batch with speech chunks
+    from many clips instead of the one or two a short clip has. Returns one word-level
+    list per clip, with timestamps relative to that clip.
+    """
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=np.float32)
+    offsets = []
+    pieces = []
+    position = 0
+    for audio in audios:
+        offsets.append(position / sample_rate)
+        pieces.extend([audio, gap])
+        position += audio.size + gap.size
+    
+    try:
+        transcribe_kwargs = {"batch_size": batch_size} if batch_size else {}
+        segments, info = whisper_model.transcribe(np.concatenate(pieces), language=language, word_timestamps=True, beam_size=1, vad_filter=True, **transcribe_kwargs)
+        words = [word for segment in segments for word in (segment.words or [])]
+    except Exception as e:
+        print(f"Batch transcription error: {e}")
+        return [[{'word': 'TRANSCRIPTION FAILED', 'start': 0.0, 'end': 2.0}] for _ in audios]
+    
+    wordlevel_infos = [[] for _ in audios]
+    for word in words:
+        # A word belongs to the clip its midpoint falls in
+        clip = max(0, bisect.bisect_right(offsets, (word.start + word.end) / 2) - 1)
+        clip_duration = audios[clip].size / sample_rate
+        start = min(max(0.0, word.start - offsets[clip]), clip_duration)
+        end = min(max(start, word.end - offsets[clip]), clip_duration)
+        wordlevel_infos[clip].append({'word': word.word.upper(), 'start': start, 'end': end})
+    
+    return [info or [{'word': 'NO SPEECH DETECTED', 'start': 0.0, 'end': 2.0}] for info in wordlevel_infos]
+
 def split_text_into_lines(data, v_type, MaxChars):
     """Split transcribed words into subtitle lines"""
     MaxDuration = 2.5
@@ -240,13 +285,13 @@ def split_text_into_lines(data, v_type, MaxChars):
         start = word_data["start"]
         end = word_data["end"]
 
+        # Keep a running length of " ".join(line) instead of rebuilding the string per word
+        line_chars += len(word) + (1 if line else 0)
         line.append(word_data)
         line_duration += end - start
 
-        temp = " ".join(item["word"] for item in line)
-
         # Check if adding a new word exceeds the maximum character count or duration
-        new_line_chars = len(temp)
+        new_line_chars = line_chars
 
         duration_exceeded = line_duration > MaxDuration
         chars_exceeded = new_line_chars > MaxChars
@@ -281,99 +326,69 @@ def split_text_into_lines(data, v_type, MaxChars):
 
     return subtitles
 
-def set_clip_position(clip, position, relative=False):
-    """Helper function to set position compatibly with different MoviePy versions"""
-    try:
-        return clip.set_position(position, relative=relative)
-    except (AttributeError, TypeError):
-        try:
-            return clip.with_position(position, relative=relative)
-        except (AttributeError, TypeError):
-            try:
-                # Try without relative parameter (older versions)
-                if relative:
-                    print("Warning: Relative positioning not supported, using absolute")
-                return clip.set_position(position)
-            except AttributeError:
-                try:
-                    return clip.with_position(position)
-                except AttributeError:
-                    # Last resort - return unmodified clip
-                    print(f"Warning: Could not set position on clip, returning unmodified")
-                    return clip
+def ass_color(color):
+    """Convert a color name or (#)RRGGBB hex string to an ASS &H00BBGGRR& color"""
+    if not color.startswith('#') and len(color) == 6 and all(c in "0123456789abcdefABCDEF" for c in color):
+        color = f"#{color}"
+    red, green, blue = ImageColor.getrgb(color)[:3]
+    return f"&H00{blue:02X}{green:02X}{red:02X}&"
 
-def create_caption(textJSON, framesize, v_type, highlight_color, fontsize, color, font="Arial", stroke_color='black', stroke_width=2.6):
-    """Create a single text clip for each subtitle line with auto-wrapping"""
-    # Get frame dimensions
-    frame_width, frame_height = framesize
-    
-    # Calculate duration
-    start_time = textJSON['start']
-    end_time = textJSON['end']
-    duration = end_time - start_time
-    
-    # MODIFIED: Use larger font size (7% of video height instead of 4%)
-    font_size = int(frame_height * 0.07)
-    
-    # Keep max width for text wrapping
-    max_text_width = int(frame_width * 0.8)
-    
-    # Get bold font path
-    bold_font_path = None
-    if FONTS and 'bold' in FONTS and os.path.exists(FONTS['bold']):
-        bold_font_path = FONTS['bold']
-    else:
-        bold_font_path = font  # Use the font parameter as fallback
-    
-    # MODIFIED: Increase stroke width significantly for more prominence
-    stroke_width = max(3.5, fontsize / 10)
+def lines_to_ass(linelevel_subtitles, width, height, color="white", highlight_color=None, font="Arial"):
+    """Build an ASS script showing each subtitle line centered, for a width x height frame
     
-    # Create the complete subtitle text
-    full_text = " ".join([word['word'] for word in textJSON['textcontents']])
+    Bold uppercase text at 7% of the frame height, wrapped within 80% of the width,
+    with a thick black outline and a short fade in and out. With highlight_color, each
+    word turns that color as it is spoken (ASS \\k karaoke).
+    """
+    font_size = int(height * 0.07)
+    side_margin = int(width * 0.1)
+    primary_color = ass_color(highlight_color or color)
+    secondary_color = ass_color(color)
     
-    # Add this check inside create_caption
-    if color and not color.startswith('#') and not color in ['white', 'black', 'red', 'blue', 'green', 'yellow']:
-        color = f"#{color}"
+    lines = [
+        "[Script Info]",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,{font},{font_size},{primary_color},{secondary_color},&H00000000&,&H00000000&,1,0,0,0,100,100,0,0,1,3.5,0,5,{side_margin},{side_margin},0,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
     
-    # MODIFIED: Force uppercase text for better visibility like in your example
-    full_text = full_text.upper()
+    for line in linelevel_subtitles:
+        if not all(key in line for key in ['word', 'start', 'end']):
+            continue
+        words = line.get('textcontents') or [line]
+        if highlight_color:
+            # \k durations are in centiseconds and run back to back from the line start
+            parts = []
+            cursor = line['start']
+            for idx, word in enumerate(words):
+                next_start = words[idx + 1]['start'] if idx + 1 < len(words) else line['end']
+                lead = round((word['start'] - cursor) * 100)
+                if lead > 0:
+                    parts.append(f"{{\\k{lead}}}")
+                parts.append(f"{{\\k{max(0, round((next_start - word['start']) * 100))}}}{word['word'].strip().upper()} ")
+                cursor = max(cursor, next_start)
+            text = "".join(parts).rstrip()
+        else:
+            text = " ".join(word['word'].strip() for word in words).upper()
+        if not text:
+            continue
+        fade_ms = int(min(0.15, (line['end'] - line['start']) / 8) * 1000)
+        lines.append(f"Dialogue: 0,{format_ass_time(line['start'])},{format_ass_time(line['end'])},Default,,0,0,0,,{{\\fad({fade_ms},{fade_ms})}}{text}")
     
-    # Create a single text clip with auto-wrapping
-    try:
-        text_clip = TextClip(
-            text=full_text,
-            font=bold_font_path,
-            font_size=font_size,
-            color=color,
-            stroke_color=stroke_color,
-            stroke_width=int(stroke_width),
-            method="caption",
-            size=(max_text_width, None)
-        )
-        
-        # Set timing
-        text_clip = text_clip.with_start(start_time).with_duration(duration)
-        
-        # Add fade effects
-        try:
-            from moviepy.video.fx import fadeout, fadein
-            fade_duration = min(0.15, duration / 8)
-            text_clip = text_clip.fx(fadein, fade_duration)
-            text_clip = text_clip.fx(fadeout, fade_duration)
-        except ImportError:
-            pass
-        
-        return [text_clip], [{"word": full_text, "start": start_time, "end": end_time, "duration": duration}]
-        
-    except Exception as e:
-        print(f"Error creating caption: {e}")
-        return [], []
+    return "\n".join(lines) + "\n"
 
 def get_final_cliped_video(videofilename, linelevel_subtitles, v_type, subs_position, highlight_color, fontsize, opacity, color, output_dir):
-    """Apply subtitles to video with highlighting effect"""
+    """Burn line-level subtitles into the video with FFmpeg's ass filter (libass)"""
     try:
-        # IMPORTANT: Explicitly override any position parameter to ensure only center
-        # This prevents any function calls with "bottom" position from creating subtitles
+        # Subtitles are always centered, whatever position the caller asks for
         subs_position = "center"
         
         # Ensure the output directory exists
@@ -389,109 +404,51 @@ def get_final_cliped_video(videofilename, linelevel_subtitles, v_type, subs_posi
         if not linelevel_subtitles or not isinstance(linelevel_subtitles, list):
             print("Invalid subtitle data, returning original video")
             return videofilename
-            
+        
         try:
-            # Try to load the video file
-            input_video = VideoFileClip(videofilename)
+            probe = ffmpeg.probe(videofilename, select_streams='v:0', show_entries='stream=width,height', read_intervals='%+#1')
+            width, height = int(probe['streams'][0]['width']), int(probe['streams'][0]['height'])
         except Exception as e:
-            print(f"Error loading video file: {e}")
-            return videofilename
-                
-        frame_size = input_video.size
-        all_linelevel_splits = []
-
-        for line in linelevel_subtitles:
-            try:
-                # Verify line has required fields
-                if not all(key in line for key in ['word', 'start', 'end']):
-                    continue
-                    
-                # Create caption for this line - Use the color parameter passed from the style
-                out_clips, positions = create_caption(line, frame_size, v_type, None, fontsize, color)
-                
-                # Skip if no clips or positions were created
-                if not out_clips or not positions:
-                    continue
-                
-                # Create the text overlay without background
-                clip_to_overlay = CompositeVideoClip(out_clips)
-
-                # Position in center only
-                video_width, video_height = input_video.size
-                overlay_width, overlay_height = clip_to_overlay.size
-                
-                # Calculate center coordinates
-                x_center = (video_width - overlay_width) / 2
-                y_center = (video_height - overlay_height) / 2
-                
-                # Center positioning only
-                clip_to_overlay = set_clip_position(clip_to_overlay, (x_center, y_center))
-                all_linelevel_splits.append(clip_to_overlay)
-                
-            except Exception as line_error:
-                print(f"Error processing subtitle line: {line_error}")
-                continue
-
-        # If we couldn't create any subtitle overlays, return original video
-        if not all_linelevel_splits:
+            print(f"Error probing video file: {e}")
             return videofilename
-
-        # Create final composite video with ONLY center white subtitles
-        try:
-            final_video = CompositeVideoClip([input_video] + all_linelevel_splits)
-            
-            # Set the audio of the final video
-            if input_video.audio is not None:
-                try:
-                    # First try set_audio
-                    final_video = final_video.set_audio(input_video.audio)
-                except (AttributeError, TypeError):
-                    try:
-                        # Then try set_audio_all
-                        final_video = final_video.set_audio_all(input_video.audio)
-                    except (AttributeError, TypeError):
-                        try:
-                            # Try audio_fadein
-                            final_video = final_video.audio_fadein(0)
-                        except (AttributeError, TypeError):
-                            # Last resort - create a new CompositeVideoClip
-                            print("Using alternative method for audio attachment")
-                            try:
-                                final_video = CompositeVideoClip([final_video])
-                                final_video.audio = input_video.audio
-                            except Exception as audio_error:
-                                print(f"Could not attach audio: {audio_error}")
-            
-            # Write the final video file
-            final_video.write_videofile(
-                output_path, 
-                fps=24, 
-                codec="libx264", 
-                audio_codec="aac",
-                threads=2,
-                logger=None
-            )
-            
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                return output_path
-            else:
-                return videofilename
-                
-        except Exception as render_error:
-            print(f"Error rendering final video: {render_error}")
+        
+        # Use the downloaded Poppins Bold through libass's fontsdir when it is available
+        font = "Arial"
+        ass_filter_options = ""
+        if FONTS and 'bold' in FONTS and os.path.exists(FONTS['bold']):
+            font = "Poppins"
+            ass_filter_options = f":fontsdir={os.path.dirname(FONTS['bold'])}"
+        
+        ass_path = os.path.join(output_dir, 'subs.ass')
+        with open(ass_path, 'w', encoding='utf-8') as f:
+            f.write(lines_to_ass(linelevel_subtitles, width, height, color or "white", highlight_color, font))
+        
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", videofilename,
+            "-vf", f"ass={ass_path}{ass_filter_options}",
+            *h264_encoder_args(crf=23, preset="veryfast"),
+            "-c:a", "copy",
+            output_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Error rendering final video: {result.stderr[-2000:]}")
             return videofilename
+        
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            return output_path
+        return videofilename
             
     except Exception as e:
         print(f"Global error in get_final_cliped_video: {e}")
         return videofilename
 
-def format_srt_time(seconds):
-    """Format time in SRT format (HH:MM:SS,mmm)"""
-    hours = int(seconds / 3600)
-    minutes = int((seconds % 3600) / 60)
-    secs = seconds % 60
-    milliseconds = int((secs - int(secs)) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{int(secs):02d},{milliseconds:03d}"
+def format_ass_time(seconds):
+    """Format time in ASS format (H:MM:SS.cc)"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{int(seconds % 1 * 100):02d}"
 
 def add_subtitle(videofilename, audiofilename, v_type, subs_position, highlight_color, fontsize, opacity, MaxChars, color, wordlevel_info, output_dir):
     """Complete process to add subtitles to a video"""
@@ -575,23 +532,75 @@ def add_subtitle(videofilename, audiofilename, v_type, subs_position, highlight_
         # Return original video as fallback
         return videofilename, []
 
-def load_whisper_model(model_size="base"):
-    """Load and initialize the Whisper model"""
+def load_cuda_whisper_model(model_size, compute_type, num_workers=1):
+    """Load Whisper on CUDA, with CTranslate2's FlashAttention where the GPU and build support it
+    
+    FlashAttention needs CTranslate2 >= 4.3 and an Ampere or newer GPU; anywhere else
+    the model is loaded with regular attention.
+    """
+    try:
+        return WhisperModel(model_size, device="cuda", compute_type=compute_type, num_workers=num_workers, flash_attention=True)
+    except (TypeError, ValueError, RuntimeError) as e:
+        # TypeError: a CTranslate2 without the flash_attention option. Other errors (no
+        # CUDA device, out of memory, ...) would only fail again, so they are re-raised
+        if not isinstance(e, TypeError) and "flash" not in str(e).lower():
+            raise
+        print(f"Loading without FlashAttention: {e}")
+        return WhisperModel(model_size, device="cuda", compute_type=compute_type, num_workers=num_workers)
+
+def load_whisper_model(model_size="base", device=None, compute_type=None, num_workers=1):
+    """Load and initialize the Whisper model
+    
+    With no device given, CUDA is tried first and CPU is the fallback. compute_type
+    defaults to int8_float16 on CUDA (int8 weights, float16 activations) and int8 on CPU.
+    num_workers lets that many transcribe() calls from different threads run in parallel.
+    """
     print('Loading the Whisper Model...')
+    if device is not None:
+        compute_type = compute_type or ("int8_float16" if device == "cuda" else "int8")
+        if device == "cuda":
+            model = load_cuda_whisper_model(model_size, compute_type, num_workers)
+        else:
+            model = WhisperModel(model_size, device=device, compute_type=compute_type, num_workers=num_workers)
+        print(f"Model loaded on {device} ({compute_type})")
+        return model
+    
     try:
         # First try with CUDA
-        model = WhisperModel(model_size, device="cuda", compute_type="float16")
+        # int8 weights halve the model's memory traffic on the GPU at practically the same accuracy
+        model = load_cuda_whisper_model(model_size, compute_type or "int8_float16", num_workers)
         print("Model loaded with CUDA support")
     except (RuntimeError, ValueError) as e:
         # Fall back to CPU if CUDA is not available
         print(f"CUDA not available: {e}")
         print("Loading model on CPU instead...")
-        model = WhisperModel(model_size, device="cpu", compute_type="float32")
+        # int8 weights run several times faster than float32 on CPU with negligible accuracy loss
+        model = WhisperModel(model_size, device="cpu", compute_type="int8", num_workers=num_workers)
         print("Model loaded with CPU support")
     
     print("Model loaded successfully!")
     return model
 
+def create_batched_pipeline(model):
+    """Wrap a loaded model in a BatchedInferencePipeline, or return None if this faster-whisper lacks it"""
+    if BatchedInferencePipeline is None:
+        return None
+    try:
+        return BatchedInferencePipeline(model=model)
+    except Exception as e:
+        print(f"Could not create batched Whisper pipeline: {e}")
+        return None
+
+def warm_up_whisper_model(model):
+    """Run a one-second silent transcription so the first real call skips model warm-up"""
+    try:
+        segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), word_timestamps=True)
+        list(segments)
+        print("Whisper model warmed up")
+    except Exception as e:
+        print(f"Whisper warm-up skipped: {e}")
+    return model
+
 def test_subtitle_pipeline(input_video_path, output_dir="output"):
     """Test the complete subtitling pipeline with a sample video"""
     print(f"Testing subtitle pipeline with video: {input_video_path}")
@@ -599,9 +608,9 @@ def test_subtitle_pipeline(input_video_path, output_dir="output"):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # 1. Extract audio from video
-    audio_path = create_audio(input_video_path)
-    if not audio_path:
+    # 1. Decode audio from video
+    audio = load_audio_array(input_video_path)
+    if audio is None:
         print("Audio extraction failed")
         return None
     
@@ -609,7 +618,7 @@ def test_subtitle_pipeline(input_video_path, output_dir="output"):
     model = load_whisper_model("base")
     
     # 3. Transcribe audio
-    word_level_info = transcribe_audio(model, audio_path)
+    word_level_info = transcribe_audio(model, audio)
     
     # 4. Add subtitles to video - CHANGED to match test_movie.py settings
     v_type = "9x16"  # Changed from "highlights" to "9x16"
@@ -623,7 +632,7 @@ def test_subtitle_pipeline(input_video_path, output_dir="output"):
     # 5. Process and add subtitles
     output_path, _ = add_subtitle(
         input_video_path, 
-        audio_path, 
+        None,  # Audio was decoded in memory, there is no audio file
         v_type, 
         subs_position, 
         highlight_color, 
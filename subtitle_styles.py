@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 import os
-import sys
 import asyncio
 from pathlib import Path
 import time
 import argparse
-import tempfile
 import subprocess
 
 # Import modules from the movie.py script
-from movie import load_whisper_model, create_audio, transcribe_audio, add_subtitle
+from movie import load_whisper_model, load_audio_array, transcribe_audio, format_ass_time
+from video_formatter import h264_encoder_args
 
 # Define style presets
 SUBTITLE_STYLES = {
@@ -63,16 +62,74 @@ SUBTITLE_STYLES = {
     }
 }
 
+def compile_ass_style(style_config):
+    """Resolve a SUBTITLE_STYLES entry into the values of an ASS Style line
+    
+    Colors become ASS &HAABBGGRR& strings; the result only depends on the style,
+    so it can be computed once and reused for every clip.
+    """
+    text_color = style_config.get("text_color", "FFFF00")
+    use_outline = style_config.get("use_outline", True)
+    outline_color = style_config.get("outline_color", "000000") if use_outline else None
+    
+    return {
+        "font_size": style_config.get("font_size", 24),
+        "primary_color": f"&H00{text_color[4:6]}{text_color[2:4]}{text_color[0:2]}&",
+        "outline_color": f"&H00{outline_color[4:6]}{outline_color[2:4]}{outline_color[0:2]}&" if outline_color else "&H000000&",
+        "bold": 1 if style_config.get("bold", False) else 0,
+        "outline_size": 1 if use_outline else 0,
+        "shadow": 1 if use_outline else 0,
+    }
+
+def words_to_ass(wordlevel_info, style_config, width, height, ass_style=None):
+    """Build an ASS subtitle script showing each word centered, for a width x height frame
+    
+    FFmpeg's ass filter (libass) burns this in during an encode, so no per-frame
+    text rendering happens in Python. ass_style is compile_ass_style(style_config),
+    when already known.
+    """
+    if ass_style is None:
+        ass_style = compile_ass_style(style_config)
+    
+    # Alignment 5 = middle center of the screen; the margin only matters for other alignments
+    top_section_height = int(height * 0.4)  # Top 40% of video
+    margin_v = int(top_section_height * 0.5)  # Center within top section
+    
+    lines = [
+        "[Script Info]",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,Arial,{ass_style['font_size']*2},{ass_style['primary_color']},&H00FFFFFF&,{ass_style['outline_color']},&H80000000&,{ass_style['bold']},0,0,0,100,100,0,0,1,{ass_style['outline_size']},{ass_style['shadow']},5,30,30,{margin_v},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    
+    # Add each word as an event
+    for word in wordlevel_info:
+        text = word["word"].strip()
+        if text:  # Only add non-empty words
+            lines.append(f"Dialogue: 0,{format_ass_time(word['start'])},{format_ass_time(word['end'])},Default,,0,0,0,,{text}")
+    
+    return "\n".join(lines) + "\n"
+
 async def apply_subtitle_style(
     input_video,
     output_dir,
     style_name,
     style_config,
     model=None,
-    audio_path=None,
+    audio=None,
     word_level_info=None
 ):
-    """Apply a specific subtitle style to a video"""
+    """Apply a specific subtitle style to a video
+    
+    audio is the clip's decoded 16 kHz samples (see load_audio_array), if already known.
+    """
     style_output_dir = os.path.join(output_dir, style_name)
     os.makedirs(style_output_dir, exist_ok=True)
     
@@ -80,72 +137,51 @@ async def apply_subtitle_style(
     print(f"Settings: {style_config}")
     
     # Extract audio only once if not provided
-    if not audio_path:
+    if audio is None:
         print("Extracting audio...")
-        audio_path = create_audio(input_video)
-        if not audio_path:
+        audio = await asyncio.to_thread(load_audio_array, input_video)
+        if audio is None:
             print("Failed to extract audio")
             return None
     
     # Load model only once if not provided
     if model is None:
         print("Loading Whisper model...")
-        model = load_whisper_model("small")
+        model = await asyncio.to_thread(load_whisper_model, "small")
     
     # Transcribe only once if not provided
     if word_level_info is None:
         print("Transcribing audio...")
-        word_level_info = transcribe_audio(model, audio_path)
-    
-    # Get configuration values with defaults
-    font_size = int(style_config.get("font_size", 7))
-    text_color = style_config.get("text_color", "FFFF00")
-    use_outline = style_config.get("use_outline", True)
-    outline_color = style_config.get("outline_color", "000000") if use_outline else None
-    
-    # Monkey patch the create_caption function to handle our outline settings
-    from movie import create_caption as original_create_caption
-    import functools
-    
-    def create_caption_wrapper(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # args[7] is stroke_color (the 8th parameter)
-            new_args = list(args)
-            if not use_outline:
-                new_args[7] = None  # Set stroke_color to None if outline is disabled
-            return func(*new_args, **kwargs)
-        return wrapper
+        word_level_info = await asyncio.to_thread(transcribe_audio, model, audio)
     
-    # Apply the wrapper
-    import movie
-    movie.create_caption = create_caption_wrapper(movie.create_caption)
-    
-    # Standard parameters
-    v_type = "9x16"
-    subs_position = "center"
-    highlight_color = None
-    opacity = 0.0
-    max_chars = 12
-    
-    # Process and add subtitles
+    # Burn the words in with FFmpeg/libass instead of rendering frames through MoviePy
     start_time = time.time()
-    output_file, _ = add_subtitle(
-        input_video,
-        audio_path,
-        v_type,
-        subs_position,
-        highlight_color,
-        font_size,
-        opacity,
-        max_chars,
-        f"#{text_color}",
-        word_level_info,
-        style_output_dir
-    )
+    probe_cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height",
+        "-read_intervals", "%+#1",
+        "-of", "csv=p=0",
+        str(input_video)
+    ]
+    # Blocking work runs in threads so the styles started by test_all_styles actually overlap
+    result = await asyncio.to_thread(subprocess.run, probe_cmd, stdout=subprocess.PIPE, text=True, check=True)
+    width, height = map(int, result.stdout.strip().split(','))
+    
+    subtitle_file = os.path.join(style_output_dir, "subs.ass")
+    with open(subtitle_file, 'w', encoding='utf-8') as f:
+        f.write(words_to_ass(word_level_info, style_config, width, height))
     
-    # Restore original create_caption function
-    movie.create_caption = original_create_caption
+    output_file = os.path.join(style_output_dir, "output.mp4")
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", str(input_video),
+        "-vf", f"ass={subtitle_file}",
+        *h264_encoder_args(crf=23, preset="veryfast"),
+        "-c:a", "copy",
+        output_file
+    ]
+    await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True)
     
     end_time = time.time()
     duration = end_time - start_time
@@ -173,10 +209,13 @@ async def test_all_styles(input_video, output_dir="subtitle_style_tests"):
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
-    # Extract audio and transcribe only once
-    audio_path = create_audio(input_video)
-    model = load_whisper_model("small")
-    word_level_info = transcribe_audio(model, audio_path)
+    # Extract audio and transcribe only once, off the event loop; the audio decode
+    # and the model load don't depend on each other, so they run together
+    audio, model = await asyncio.gather(
+        asyncio.to_thread(load_audio_array, input_video),
+        asyncio.to_thread(load_whisper_model, "small")
+    )
+    word_level_info = await asyncio.to_thread(transcribe_audio, model, audio)
     
     # Process all styles concurrently
     tasks = []
@@ -188,7 +227,7 @@ async def test_all_styles(input_video, output_dir="subtitle_style_tests"):
                 style_name,
                 style_config,
                 model,
-                audio_path,
+                audio,
                 word_level_info
             )
         )
@@ -205,8 +244,8 @@ async def test_all_styles(input_video, output_dir="subtitle_style_tests"):
         print(f"Settings: {result['settings']}")
         print("-" * 40)
     
-    # Create comparison video
-    comparison_path = create_comparison_video(results, output_dir)
+    # Create comparison video; the grid encode runs off the event loop like the style renders
+    comparison_path = await asyncio.to_thread(create_comparison_video, results, output_dir)
     if comparison_path:
         print(f"\n✅ Comparison video created: {comparison_path}")
     
@@ -273,9 +312,7 @@ def create_comparison_video(results, output_dir):
             # Use the audio from the first video
             "-map", "0:a",
             # Set output encoding parameters
-            "-c:v", "libx264", 
-            "-crf", "23",
-            "-preset", "medium",
+            *h264_encoder_args(crf=23, preset="veryfast"),
             "-c:a", "aac",
             # Set a consistent higher FPS
             "-r", "60",
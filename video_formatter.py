@@ -3,6 +3,117 @@ import os
 import numpy as np
 from pathlib import Path
 import random  # DO NOT REMOVE THE RANDOM START
+from functools import lru_cache
+
+# First video stream's "width,height"; dimensions come from the header, so read no further
+DIMENSIONS_PROBE_CMD = [
+    "ffprobe", "-v", "error", "-select_streams", "v:0",
+    "-show_entries", "stream=width,height", "-read_intervals", "%+#1", "-of", "csv=p=0"
+]
+
+# Hardware H.264 encoders in order of preference; libx264 is the software fallback
+HARDWARE_H264_ENCODERS = ["h264_nvenc", "h264_qsv", "h264_videotoolbox"]
+
+# Threads given to each libx264 encode; the workflow sizes its render pool to match
+ENCODER_THREADS = 4
+
+# Intermediates (highlight cuts, background loops) are re-encoded by a later step, so
+# encode them as fast as possible at high quality. This is still lossy: the final encode
+# adds a second generation. They live too long and are too large for -qp 0 to pay off
+INTERMEDIATE_ENCODE = {"crf": 18, "preset": "ultrafast"}
+
+@lru_cache(maxsize=None)
+def detect_h264_encoder():
+    """Return the first H.264 encoder that actually works on this machine
+    
+    Being listed by `ffmpeg -encoders` only means the encoder was compiled in, so
+    each candidate is also test-encoded on a tiny synthetic frame.
+    """
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=10)
+        available = result.stdout
+    except Exception as e:
+        print(f"Could not list FFmpeg encoders: {e}")
+        return "libx264"
+    
+    for encoder in HARDWARE_H264_ENCODERS:
+        if encoder not in available:
+            continue
+        test_cmd = [
+            "ffmpeg", "-hide_banner", "-v", "error",
+            "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+            "-frames:v", "1",
+            "-c:v", encoder,
+            "-f", "null", "-"
+        ]
+        try:
+            if subprocess.run(test_cmd, capture_output=True, timeout=15).returncode == 0:
+                print(f"Using hardware H.264 encoder: {encoder}")
+                return encoder
+        except Exception:
+            continue
+    
+    print("No hardware H.264 encoder available, using libx264")
+    return "libx264"
+
+# h264_qsv only knows veryfast..veryslow, so x264's faster presets map to its fastest
+QSV_PRESETS = {"ultrafast": "veryfast", "superfast": "veryfast"}
+
+def h264_encoder_args(crf=23, preset="veryfast", tune=None):
+    """FFmpeg video codec arguments for the detected H.264 encoder at roughly the given quality"""
+    encoder = detect_h264_encoder()
+    if encoder == "h264_nvenc":
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", str(crf), "-b:v", "0"]
+    if encoder == "h264_qsv":
+        return ["-c:v", "h264_qsv", "-preset", QSV_PRESETS.get(preset, preset), "-global_quality", str(crf)]
+    if encoder == "h264_videotoolbox":
+        # VideoToolbox has no CRF mode; 8 Mbit/s suits 1080x1920 shorts at CRF 23, and
+        # like x264's CRF scale the rate doubles for every 6 steps of higher quality
+        bitrate_kbps = int(8000 * 2 ** ((23 - crf) / 6))
+        return ["-c:v", "h264_videotoolbox", "-b:v", f"{bitrate_kbps}k", "-allow_sw", "1"]
+    
+    args = [
+        "-c:v", "libx264", "-crf", str(crf), "-preset", preset,
+        "-threads", str(ENCODER_THREADS),
+        "-x264-params", f"sliced-threads=0:threads={ENCODER_THREADS}"
+    ]
+    if tune:
+        args.extend(["-tune", tune])
+    return args
+
+def hwaccel_decode_args():
+    """FFmpeg input options that decode on the same GPU as the detected encoder, if any
+    
+    Decoded frames are copied back to system memory, since the filter graphs (libass
+    in particular) run on the CPU; FFmpeg falls back to software decoding by itself
+    when the GPU cannot decode an input.
+    """
+    encoder = detect_h264_encoder()
+    if encoder == "h264_nvenc":
+        return ["-hwaccel", "cuda"]
+    if encoder == "h264_videotoolbox":
+        return ["-hwaccel", "videotoolbox"]
+    return []
+
+@lru_cache(maxsize=None)
+def ffmpeg_has_filter(name):
+    """Whether this FFmpeg build includes the named filter"""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-filters"], capture_output=True, text=True, timeout=10)
+    except Exception:
+        return False
+    return any(line.split()[1:2] == [name] for line in result.stdout.splitlines())
+
+def gpu_scale(width, height):
+    """Input options and a scale filter that keep decoding and scaling on the GPU when possible
+    
+    Returns (input_args, scale_filter). With NVENC in use and scale_cuda built in, the
+    input is decoded into CUDA memory, scaled there and downloaded once for the CPU
+    filters that follow; otherwise it is hwaccel_decode_args() and a plain scale.
+    """
+    if detect_h264_encoder() == "h264_nvenc" and ffmpeg_has_filter("scale_cuda"):
+        return ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"], f"scale_cuda={width}:{height},hwdownload,format=nv12"
+    return hwaccel_decode_args(), f"scale={width}:{height}"
 
 class VideoFormatter:
     """Module responsible for video formatting operations using ffmpeg"""
@@ -13,56 +124,9 @@ class VideoFormatter:
     
     def ensure_even_dimensions(self, width, height):
         """Ensure both width and height are even numbers, required by most video codecs"""
-        width = int(width)
-        height = int(height)
-        if width % 2 != 0:
-            width += 1
-        if height % 2 != 0:
-            height += 1
-        return width, height
+        # Round odd values up to the next even number without branching
+        return (int(width) + 1) & ~1, (int(height) + 1) & ~1
     
-    def format_for_mobile(self, input_video, output_filename=None):
-        """Format video for mobile viewing in 9:16 aspect ratio without adding vertical black bars"""
-        if output_filename is None:
-            output_filename = f"{Path(input_video).stem}_mobile.mp4"
-        output_path = self.output_dir / output_filename
-        print(f"Formatting {input_video} for mobile viewing")
-        
-        try:
-            # Get video dimensions
-            probe_cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=width,height", 
-                "-of", "csv=p=0"
-            ]
-            result = subprocess.run(probe_cmd + [str(input_video)], stdout=subprocess.PIPE, text=True, check=True)
-            width, height = map(int, result.stdout.strip().split(','))
-            print(f"Source dimensions: {width}x{height}")
-            
-            # Scale down to 1080px width, preserving aspect ratio.
-            # ENSURE HEIGHT IS EVEN (this is the critical fix)
-            target_width = 1080
-            target_height = int(height * (target_width / width))
-            target_width, target_height = self.ensure_even_dimensions(target_width, target_height)
-            
-            format_cmd = [
-                "ffmpeg", "-y",
-                "-i", str(input_video),
-                "-vf", f"scale={target_width}:{target_height},setsar=1:1",
-                "-c:v", "libx264", "-crf", "23",
-                "-c:a", "aac", "-b:a", "192k",
-                str(output_path)
-            ]
-            print(f"Running command: {' '.join(format_cmd)}")
-            subprocess.run(format_cmd, check=True, capture_output=True)
-            print(f"Formatted mobile video saved to: {output_path}")
-            return output_path
-        except Exception as e:
-            print(f"Error formatting video: {e}")
-            return None
-
     def format_asset_for_bottom(self, asset_video, crop_offset=100, output_filename=None):
         """
         Format asset video for bottom placement by cropping the top slightly.
@@ -84,7 +148,7 @@ class VideoFormatter:
             "-ss", str(random_start),
             "-i", str(asset_video),
             "-vf", crop_filter,
-            "-c:v", "libx264", "-crf", "23",
+            *h264_encoder_args(**INTERMEDIATE_ENCODE),
             "-c:a", "aac", "-b:a", "192k",
             str(output_path)
         ]
@@ -93,109 +157,100 @@ class VideoFormatter:
         print(f"Cropped asset video saved to: {output_path}")
         return output_path
         
-    def loop_subway_surfers(self, asset_video, target_duration, output_filename=None, start_time=None):
+    def loop_subway_surfers_command(self, asset_video, target_duration, output_filename=None, start_time=None, size=None):
         """
-        Prepares an asset video for use as background by cropping the top portion.
+        Build the FFmpeg command that prepares an asset video for use as background.
         
         Args:
             asset_video: Path to the asset video file
             target_duration: Duration in seconds the output video should be
             output_filename: Optional name for the output file
             start_time: Specific time in seconds to start the video segment (if None, uses a random start)
+            size: asset_video's (width, height), when already known
             
         Returns:
-            Path to the processed video file
+            (cmd, output_path), so the caller decides how to run it
         """
         if output_filename is None:
             output_filename = f"bg_{Path(asset_video).stem}.mp4"
         output_path = self.output_dir / output_filename
-        print(f"Preparing background video from {asset_video}")
         
-        try:
-            # Get video dimensions and duration
-            probe_cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=width,height", 
-                "-of", "csv=p=0"
-            ]
-            result = subprocess.run(probe_cmd + [str(asset_video)], stdout=subprocess.PIPE, text=True, check=True)
-            width, height = map(int, result.stdout.strip().split(','))
-            print(f"Asset video dimensions: {width}x{height}")
-            
-            # Ensure width is 1080px for consistent stacking
-            target_width = 1080
-            
-            # Calculate crop values - crop top 25% 
-            crop_percent = 0.25
-            crop_pixels = int(height * crop_percent)
-            # Ensure crop value is even
-            if crop_pixels % 2 != 0:
-                crop_pixels += 1
-                
-            # For extra safety, use our even dimensions utility
-            target_width, crop_pixels = self.ensure_even_dimensions(target_width, crop_pixels)
-                
-            print(f"Cropping {crop_pixels}px ({crop_percent*100}%) from the top of the video")
+        # Get video dimensions
+        if size is None:
+            result = subprocess.run(DIMENSIONS_PROBE_CMD + [str(asset_video)], stdout=subprocess.PIPE, text=True, check=True)
+            size = map(int, result.stdout.strip().split(','))
+        width, height = size
+        print(f"Asset video dimensions: {width}x{height}")
+        
+        # Ensure width is 1080px for consistent stacking
+        target_width = 1080
+        
+        # Calculate crop values - crop top 25% 
+        crop_percent = 0.25
+        crop_pixels = int(height * crop_percent)
+        # Ensure crop value is even
+        crop_pixels = (crop_pixels + 1) & ~1
             
-            # Use provided start_time or generate a random one if not provided
-            if start_time is None:
-                start_time = random.uniform(0, 5)  # random start between 0 and 5 seconds
+        # For extra safety, use our even dimensions utility
+        target_width, crop_pixels = self.ensure_even_dimensions(target_width, crop_pixels)
             
-            print(f"Using start point: {start_time:.2f}s")
+        print(f"Cropping {crop_pixels}px ({crop_percent*100}%) from the top of the video")
+        
+        # Use provided start_time or generate a random one if not provided
+        if start_time is None:
+            start_time = random.uniform(0, 5)  # random start between 0 and 5 seconds
+        
+        print(f"Using start point: {start_time:.2f}s")
+        
+        # Simple command to:
+        # 1. Start at specified/random position
+        # 2. Scale to 1080px width
+        # 3. Crop top 25%
+        # 4. Ensure all dimensions are even (required by some codecs)
+        cmd = [
+            "ffmpeg", "-y",
+            *hwaccel_decode_args(),
+            "-ss", str(start_time),
+            "-i", str(asset_video),
+            "-t", str(target_duration),
+            "-vf", f"scale={target_width}:-2,crop=in_w:in_h-{crop_pixels}:0:{crop_pixels},setsar=1:1",
+            "-an",  # Remove audio
+            *h264_encoder_args(**INTERMEDIATE_ENCODE),
+            "-pix_fmt", "yuv420p",  # Ensure compatibility
+            str(output_path)
+        ]
+        return cmd, output_path
+        
+    def loop_subway_surfers(self, asset_video, target_duration, output_filename=None, start_time=None):
+        """
+        Prepares an asset video for use as background by cropping the top portion.
+        
+        Args:
+            asset_video: Path to the asset video file
+            target_duration: Duration in seconds the output video should be
+            output_filename: Optional name for the output file
+            start_time: Specific time in seconds to start the video segment (if None, uses a random start)
             
-            # Simple command to:
-            # 1. Start at specified/random position
-            # 2. Scale to 1080px width
-            # 3. Crop top 25%
-            # 4. Ensure all dimensions are even (required by some codecs)
-            cmd = [
-                "ffmpeg", "-y",
-                "-ss", str(start_time),
-                "-i", str(asset_video),
-                "-t", str(target_duration),
-                "-vf", f"scale={target_width}:-2,crop=in_w:in_h-{crop_pixels}:0:{crop_pixels},setsar=1:1",
-                "-an",  # Remove audio
-                "-c:v", "libx264", "-crf", "23",
-                "-pix_fmt", "yuv420p",  # Ensure compatibility
-                str(output_path)
-            ]
+        Returns:
+            Path to the processed video file
+        """
+        print(f"Preparing background video from {asset_video}")
+        
+        try:
+            cmd, output_path = self.loop_subway_surfers_command(asset_video, target_duration, output_filename, start_time)
             
             print(f"Running command: {' '.join(cmd)}")
             subprocess.run(cmd, check=True, capture_output=True)
             
-            # Verify the output dimensions are even
-            verify_cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=width,height", 
-                "-of", "csv=p=0",
-                str(output_path)
-            ]
-            result = subprocess.run(verify_cmd, stdout=subprocess.PIPE, text=True, check=True)
-            out_width, out_height = map(int, result.stdout.strip().split(','))
-            
-            # If dimensions are not even, fix them
-            if out_width % 2 != 0 or out_height % 2 != 0:
-                print(f"Output has odd dimensions ({out_width}x{out_height}), fixing...")
-                fixed_path = self.output_dir / f"fixed_{output_filename}"
-                fix_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", str(output_path),
-                    "-vf", f"scale={out_width + (out_width % 2)}:{out_height + (out_height % 2)}",
-                    "-c:v", "libx264", "-crf", "23",
-                    "-pix_fmt", "yuv420p",
-                    "-an",
-                    str(fixed_path)
-                ]
-                subprocess.run(fix_cmd, check=True, capture_output=True)
-                os.replace(fixed_path, output_path)  # Replace with fixed version
-                print(f"Fixed dimensions to even values")
+            # scale=1080:-2 gives an even height and the crop removes an even number of rows,
+            # so the output is always even-sized; only double-check when debugging
+            if os.environ.get("BRAINROT_DEBUG"):
+                result = subprocess.run(DIMENSIONS_PROBE_CMD + [str(output_path)], stdout=subprocess.PIPE, text=True, check=True)
+                out_width, out_height = map(int, result.stdout.strip().split(','))
+                assert out_width == 1080 and out_height % 2 == 0, f"Unexpected background size {out_width}x{out_height}"
             
             print(f"Background video saved to: {output_path}")
             return output_path
         except Exception as e:
             print(f"Error preparing background video: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import asyncio
 import tempfile
 from pathlib import Path
 import time
@@ -8,10 +7,13 @@ import streamlit.components.v1 as components
 import zipfile
 import random
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import queue
 
 # Import from our modules
-from movie import load_whisper_model
-from brainrot_workflow import BrainrotWorkflow
+from brainrot_workflow import run_workflow_job
 from subtitle_styles import SUBTITLE_STYLES
 
 # Funny loading GIFs to show during processing
@@ -24,34 +26,11 @@ LOADING_GIFS = [
     "https://media.giphy.com/media/v1.Y2lkPTc5MGI3NjExZWNlbGcwMGpscnpidnQ2OWUxbTExdTZvYnpndm5ycm5kbGRuYnl0dCZlcD12MV9pbnRlcm5hbF9naWZfYnlfaWQmY3Q9Zw/3o7btQ0NH6Kl58CIco/giphy.gif"  # Hamster spinning
 ]
 
-# Find available background videos
-def find_background_videos():
-    """Find all available background videos in assets folder"""
-    background_videos = []
-    
-    # Check common locations for background videos
-    asset_paths = [
-        Path("assets"),
-        Path("./assets"),
-        Path("../assets"),
-        Path("/Users/barroca888/FR8/Brainrot Automacion/assets"),
-        Path.home() / "FR8/Brainrot Automacion/assets"
-    ]
-    
-    for base_path in asset_paths:
-        if base_path.exists():
-            for video_file in base_path.glob("*.mp4"):
-                background_videos.append({
-                    "name": video_file.stem,
-                    "path": str(video_file)
-                })
-    
-    return background_videos
+# st.fragment scopes reruns to a subtree (Streamlit >= 1.33); older versions just call the function
+fragment = getattr(st, "fragment", None) or (lambda func: func)
 
-# Pong Game implementation using HTML5/JavaScript for Streamlit
-def show_pong_game():
-    """Display a simple Pong game in Streamlit while processing"""
-    pong_game_html = """
+# Static Pong game markup, built once at import instead of on every rerun
+PONG_GAME_HTML = """
     <div style="width:100%; max-width:500px; margin:0 auto; background:#111; border-radius:10px; overflow:hidden; box-shadow:0 4px 16px rgba(0,0,0,0.2);">
         <h3 style="text-align:center; color:white; padding:15px; margin:0; background:linear-gradient(90deg, #FF5F6D 0%, #FFC371 100%);">🏓 Pong Game</h3>
         <p style="text-align:center; color:#ccc; margin:0; padding:10px;">Play while your video is being processed!</p>
@@ -91,8 +70,7 @@ def show_pong_game():
         let leftScore = 0;
         let rightScore = 0;
         let keysPressed = {};
-        let gamePaused = false;
-        let particles = [];
+        let rafId = null;
         let aiDifficulty = 0.8; 
         let aiReactionSpeed = 3; // Lower = faster
         
@@ -107,54 +85,149 @@ def show_pong_game():
             keysPressed[e.key] = false;
         });
         
-        canvas.addEventListener('focus', function() {
-            gamePaused = false;
-        });
+        // The loop only runs while the canvas has focus; blur cancels the pending frame
+        function resumeGame() {
+            if (!rafId) {
+                rafId = requestAnimationFrame(gameLoop);
+            }
+        }
         
-        canvas.addEventListener('blur', function() {
-            gamePaused = true;
-        });
+        function pauseGame() {
+            if (rafId) {
+                cancelAnimationFrame(rafId);
+                rafId = null;
+            }
+            drawPausedOverlay();
+        }
+        
+        function drawPausedOverlay() {
+            ctx.fillStyle = 'rgba(0, 0, 0, 0.5)';
+            ctx.fillRect(0, 0, canvas.width, canvas.height);
+            ctx.font = '24px Arial';
+            ctx.fillStyle = 'white';
+            ctx.textAlign = 'center';
+            ctx.fillText('Click to Play', canvas.width / 2, canvas.height / 2);
+        }
+        
+        canvas.addEventListener('focus', resumeGame);
+        
+        canvas.addEventListener('blur', pauseGame);
         
         canvas.addEventListener('click', function() {
             canvas.focus();
-            gamePaused = false;
+            resumeGame();
         });
         
         canvas.setAttribute('tabindex', '0');
         
-        class Particle {
-            constructor(x, y, color) {
-                this.x = x;
-                this.y = y;
-                this.size = Math.random() * 3 + 2;
-                this.speedX = Math.random() * 4 - 2;
-                this.speedY = Math.random() * 4 - 2;
-                this.color = color;
-                this.life = 1.0; // Full life
-                this.fadeSpeed = Math.random() * 0.05 + 0.02;
+        // Static gradients, created once instead of every frame
+        const leftPaddleGradient = ctx.createLinearGradient(0, 0, paddleWidth, paddleHeight);
+        leftPaddleGradient.addColorStop(0, '#FF5F6D');
+        leftPaddleGradient.addColorStop(1, '#FF8F9D');
+        
+        const rightPaddleGradient = ctx.createLinearGradient(0, 0, paddleWidth, paddleHeight);
+        rightPaddleGradient.addColorStop(0, '#FFC371');
+        rightPaddleGradient.addColorStop(1, '#FFD391');
+        
+        const ballGradient = ctx.createRadialGradient(0, 0, 0, 0, 0, ballRadius);
+        ballGradient.addColorStop(0, '#FFFFFF');
+        ballGradient.addColorStop(1, '#FF5F6D');
+        
+        // Dashed midline and center circle never change, so render them once offscreen
+        const courtCanvas = document.createElement('canvas');
+        courtCanvas.width = canvas.width;
+        courtCanvas.height = canvas.height;
+        const courtCtx = courtCanvas.getContext('2d');
+        courtCtx.strokeStyle = 'rgba(255, 255, 255, 0.2)';
+        courtCtx.setLineDash([5, 5]);
+        courtCtx.beginPath();
+        courtCtx.moveTo(courtCanvas.width / 2, 0);
+        courtCtx.lineTo(courtCanvas.width / 2, courtCanvas.height);
+        courtCtx.stroke();
+        courtCtx.setLineDash([]);
+        
+        courtCtx.beginPath();
+        courtCtx.arc(courtCanvas.width / 2, courtCanvas.height / 2, 30, 0, Math.PI * 2);
+        courtCtx.stroke();
+        
+        // Particle storage as parallel typed arrays used as a fixed-size ring buffer;
+        // when full, new particles overwrite the oldest slot
+        const PARTICLE_CAP = 256;
+        const px = new Float32Array(PARTICLE_CAP);
+        const py = new Float32Array(PARTICLE_CAP);
+        const psx = new Float32Array(PARTICLE_CAP);
+        const psy = new Float32Array(PARTICLE_CAP);
+        const psize = new Float32Array(PARTICLE_CAP);
+        const plife = new Float32Array(PARTICLE_CAP); // <= 0 marks a dead slot
+        const pfade = new Float32Array(PARTICLE_CAP);
+        const pcol = new Uint32Array(PARTICLE_CAP); // packed 0xRRGGBB
+        let pHead = 0;
+        
+        function createParticles(x, y, count, color) {
+            for (let i = 0; i < count; i++) {
+                const n = pHead;
+                pHead = (pHead + 1) % PARTICLE_CAP;
+                px[n] = x;
+                py[n] = y;
+                psize[n] = Math.random() * 3 + 2;
+                psx[n] = Math.random() * 4 - 2;
+                psy[n] = Math.random() * 4 - 2;
+                pcol[n] = color;
+                plife[n] = 1.0; // Full life
+                pfade[n] = Math.random() * 0.05 + 0.02;
             }
-            
-            update() {
-                this.x += this.speedX;
-                this.y += this.speedY;
-                this.life -= this.fadeSpeed;
-                this.size = Math.max(0, this.size - 0.1);
+        }
+        
+        function updateParticles() {
+            for (let i = 0; i < PARTICLE_CAP; i++) {
+                if (plife[i] <= 0) continue;
+                px[i] += psx[i];
+                py[i] += psy[i];
+                plife[i] -= pfade[i];
+                psize[i] = Math.max(0, psize[i] - 0.1);
             }
-            
-            draw() {
-                ctx.globalAlpha = this.life;
-                ctx.fillStyle = this.color;
-                ctx.beginPath();
-                ctx.arc(this.x, this.y, this.size, 0, Math.PI * 2);
-                ctx.fill();
-                ctx.globalAlpha = 1;
+        }
+        
+        const colorStrings = new Map();
+        function colorToCss(color) {
+            let css = colorStrings.get(color);
+            if (css === undefined) {
+                css = '#' + color.toString(16).padStart(6, '0');
+                colorStrings.set(color, css);
             }
+            return css;
         }
         
-        function createParticles(x, y, count, color) {
-            for (let i = 0; i < count; i++) {
-                particles.push(new Particle(x, y, color));
+        const ALPHA_BUCKETS = 8;
+        
+        function drawParticles() {
+            // Bucket particles by color and rounded alpha so each bucket is a single fill
+            const bucketsByColor = new Map();
+            for (let i = 0; i < PARTICLE_CAP; i++) {
+                if (plife[i] <= 0) continue;
+                let buckets = bucketsByColor.get(pcol[i]);
+                if (!buckets) {
+                    buckets = new Array(ALPHA_BUCKETS).fill(null);
+                    bucketsByColor.set(pcol[i], buckets);
+                }
+                const b = Math.min(ALPHA_BUCKETS - 1, Math.floor(plife[i] * ALPHA_BUCKETS));
+                if (!buckets[b]) {
+                    buckets[b] = new Path2D();
+                }
+                buckets[b].moveTo(px[i] + psize[i], py[i]);
+                buckets[b].arc(px[i], py[i], psize[i], 0, Math.PI * 2);
             }
+            
+            bucketsByColor.forEach(function(buckets, color) {
+                ctx.fillStyle = colorToCss(color);
+                for (let b = 0; b < ALPHA_BUCKETS; b++) {
+                    if (buckets[b]) {
+                        ctx.globalAlpha = (b + 0.5) / ALPHA_BUCKETS;
+                        ctx.fill(buckets[b]);
+                    }
+                }
+            });
+            ctx.globalAlpha = 1;
         }
         
         function moveAI() {
@@ -177,64 +250,36 @@ def show_pong_game():
         }
                 function gameLoop() {
             ctx.clearRect(0, 0, canvas.width, canvas.height);
+            ctx.drawImage(courtCanvas, 0, 0);
             
-            ctx.strokeStyle = 'rgba(255, 255, 255, 0.2)';
-            ctx.setLineDash([5, 5]);
-            ctx.beginPath();
-            ctx.moveTo(canvas.width / 2, 0);
-            ctx.lineTo(canvas.width / 2, canvas.height);
-            ctx.stroke();
-            ctx.setLineDash([]);
-            
-            ctx.beginPath();
-            ctx.arc(canvas.width / 2, canvas.height / 2, 30, 0, Math.PI * 2);
-            ctx.strokeStyle = 'rgba(255, 255, 255, 0.2)';
-            ctx.stroke();
-            
-            const leftPaddleGradient = ctx.createLinearGradient(0, leftPaddleY, paddleWidth, leftPaddleY + paddleHeight);
-            leftPaddleGradient.addColorStop(0, '#FF5F6D');
-            leftPaddleGradient.addColorStop(1, '#FF8F9D');
+            // Gradients are built once in local coordinates and positioned via translate
+            ctx.save();
+            ctx.translate(10, leftPaddleY);
             ctx.fillStyle = leftPaddleGradient;
-            ctx.fillRect(10, leftPaddleY, paddleWidth, paddleHeight);
+            ctx.fillRect(0, 0, paddleWidth, paddleHeight);
+            ctx.restore();
             
-            const rightPaddleGradient = ctx.createLinearGradient(canvas.width - paddleWidth - 10, rightPaddleY, canvas.width - 10, rightPaddleY + paddleHeight);
-            rightPaddleGradient.addColorStop(0, '#FFC371');
-            rightPaddleGradient.addColorStop(1, '#FFD391');
+            ctx.save();
+            ctx.translate(canvas.width - paddleWidth - 10, rightPaddleY);
             ctx.fillStyle = rightPaddleGradient;
-            ctx.fillRect(canvas.width - paddleWidth - 10, rightPaddleY, paddleWidth, paddleHeight);
+            ctx.fillRect(0, 0, paddleWidth, paddleHeight);
+            ctx.restore();
             
-            const ballGradient = ctx.createRadialGradient(ballX, ballY, 0, ballX, ballY, ballRadius);
-            ballGradient.addColorStop(0, '#FFFFFF');
-            ballGradient.addColorStop(1, '#FF5F6D');
+            ctx.save();
+            ctx.translate(ballX, ballY);
             ctx.beginPath();
-            ctx.arc(ballX, ballY, ballRadius, 0, Math.PI * 2);
+            ctx.arc(0, 0, ballRadius, 0, Math.PI * 2);
             ctx.fillStyle = ballGradient;
             ctx.fill();
+            ctx.restore();
             
             ctx.beginPath();
             ctx.arc(ballX + 2, ballY + 2, ballRadius, 0, Math.PI * 2);
             ctx.fillStyle = 'rgba(0, 0, 0, 0.3)';
             ctx.fill();
             
-            for (let i = particles.length - 1; i >= 0; i--) {
-                particles[i].update();
-                particles[i].draw();
-                
-                if (particles[i].life <= 0) {
-                    particles.splice(i, 1);
-                }
-            }
-            
-            if (gamePaused) {
-                ctx.fillStyle = 'rgba(0, 0, 0, 0.5)';
-                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                ctx.font = '24px Arial';
-                ctx.fillStyle = 'white';
-                ctx.textAlign = 'center';
-                ctx.fillText('Click to Play', canvas.width / 2, canvas.height / 2);
-                requestAnimationFrame(gameLoop);
-                return;
-            }
+            updateParticles();
+            drawParticles();
             
             moveAI();
             
@@ -250,62 +295,51 @@ def show_pong_game():
             
             if (ballY - ballRadius < 0 || ballY + ballRadius > canvas.height) {
                 ballSpeedY = -ballSpeedY;
-                createParticles(ballX, ballY < ballRadius ? 0 : canvas.height, 10, '#FFF');
+                createParticles(ballX, ballY < ballRadius ? 0 : canvas.height, 10, 0xFFFFFF);
             }
             
-            if (
-                ballX - ballRadius < 20 && 
-                ballY > leftPaddleY && 
-                ballY < leftPaddleY + paddleHeight
-            ) {
+            // Bitwise & evaluates all three comparisons without short-circuit branches
+            const hitLeft = (ballX - ballRadius < 20) & (ballY > leftPaddleY) & (ballY < leftPaddleY + paddleHeight);
+            if (hitLeft) {
                 const hitPosition = (ballY - leftPaddleY) / paddleHeight;
-                const angle = (hitPosition - 0.5) * Math.PI / 2; // -PI/4 to PI/4
-                
                 ballSpeedX = Math.abs(ballSpeedX) * 1.05; // Increase speed slightly
-                ballSpeedY = Math.sin(angle) * 6;
+                // sin((h - 0.5) * PI/2) approximated linearly; exact at the paddle ends
+                ballSpeedY = (hitPosition - 0.5) * 6 * Math.SQRT2;
                 
                 aiDifficulty = Math.min(0.95, aiDifficulty + 0.01);
                 
-                createParticles(ballX, ballY, 15, '#FF5F6D');
+                createParticles(ballX, ballY, 15, 0xFF5F6D);
             }
             
-            if (
-                ballX + ballRadius > canvas.width - 20 && 
-                ballY > rightPaddleY && 
-                ballY < rightPaddleY + paddleHeight
-            ) {
+            const hitRight = (ballX + ballRadius > canvas.width - 20) & (ballY > rightPaddleY) & (ballY < rightPaddleY + paddleHeight);
+            if (hitRight) {
                 const hitPosition = (ballY - rightPaddleY) / paddleHeight;
-                const angle = (hitPosition - 0.5) * Math.PI / 2; // -PI/4 to PI/4
-                
                 ballSpeedX = -Math.abs(ballSpeedX) * 1.05; // Increase speed slightly
-                ballSpeedY = Math.sin(angle) * 6;
+                // sin((h - 0.5) * PI/2) approximated linearly; exact at the paddle ends
+                ballSpeedY = (hitPosition - 0.5) * 6 * Math.SQRT2;
                 
-                createParticles(ballX, ballY, 15, '#FFC371');
+                createParticles(ballX, ballY, 15, 0xFFC371);
             }
             
             if (ballX < 0) {
                 rightScore++;
                 rightScoreDisplay.textContent = rightScore;
-                createParticles(0, ballY, 30, '#FFC371');
+                createParticles(0, ballY, 30, 0xFFC371);
                 aiDifficulty = Math.max(0.7, aiDifficulty - 0.05); // Decrease difficulty slightly
                 resetBall();
             } else if (ballX > canvas.width) {
                 leftScore++;
                 leftScoreDisplay.textContent = leftScore;
-                createParticles(canvas.width, ballY, 30, '#FF5F6D');
+                createParticles(canvas.width, ballY, 30, 0xFF5F6D);
                 aiDifficulty = Math.min(0.95, aiDifficulty + 0.05); // Increase difficulty slightly
                 resetBall();
             }
             
             const maxSpeed = 12;
-            if (Math.abs(ballSpeedX) > maxSpeed) {
-                ballSpeedX = maxSpeed * Math.sign(ballSpeedX);
-            }
-            if (Math.abs(ballSpeedY) > maxSpeed) {
-                ballSpeedY = maxSpeed * Math.sign(ballSpeedY);
-            }
+            ballSpeedX = Math.max(-maxSpeed, Math.min(maxSpeed, ballSpeedX));
+            ballSpeedY = Math.max(-maxSpeed, Math.min(maxSpeed, ballSpeedY));
             
-            requestAnimationFrame(gameLoop);
+            rafId = requestAnimationFrame(gameLoop);
         }
         
         function resetBall() {
@@ -319,13 +353,280 @@ def show_pong_game():
             ballSpeedY = 4 * Math.sin(angle);
         }
         
+        rafId = requestAnimationFrame(gameLoop);
         canvas.focus();
-        gameLoop();
     </script>
+"""
+
+# Custom CSS for compact clips and games integration
+APP_CSS = """
+<style>
+[data-testid="stVerticalBlockBorderWrapper"] {
+    transition: all 0.3s ease;
+}
+[data-testid="stVerticalBlockBorderWrapper"]:hover {
+    box-shadow: 0 4px 10px rgba(0,0,0,0.1);
+}
+.stVideo {
+    max-width: 200px !important;
+}
+.stVideo video {
+    max-height: 350px !important;
+}
+.clip-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
+    gap: 15px;
+    padding: 20px 0;
+}
+.game-canvas {
+    border-radius: 8px;
+    overflow: hidden;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+    background: #222;
+}
+.processing-header {
+    display: flex;
+    align-items: center;
+    gap: 10px;
+    margin-bottom: 10px;
+}
+.processing-header h3 {
+    margin: 0;
+}
+.clip-title {
+    font-size: 14px;
+    font-weight: 500;
+    margin-bottom: 8px;
+    text-align: center;
+}
+.clip-buttons {
+    display: flex;
+    justify-content: space-between;
+    margin-top: 8px;
+}
+.clip-buttons button {
+    padding: 3px 8px;
+    font-size: 12px;
+    border-radius: 4px;
+}
+.subtitle-preview {
+    background: #000;
+    color: var(--subtitle-color);
+    padding: 8px 16px;
+    border-radius: 5px;
+    display: inline-block;
+    margin: 10px 0;
+    text-align: center;
+    font-weight: bold;
+    text-shadow: var(--subtitle-stroke);
+}
+.loading-container {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    justify-content: center;
+    padding: 20px;
+    background: #f9f9f9;
+    border-radius: 10px;
+    margin: 20px 0;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+}
+.loading-step {
+    display: flex;
+    align-items: center;
+    gap: 10px;
+    margin: 5px 0;
+    padding: 8px;
+    border-radius: 5px;
+    width: 100%;
+}
+.loading-step.active {
+    background: rgba(255, 95, 109, 0.1);
+    border-left: 3px solid #FF5F6D;
+}
+.loading-step.completed {
+    color: #4CAF50;
+}
+.loading-spinner {
+    margin-right: 10px;
+}
+</style>
+"""
+
+@st.cache_resource(show_spinner=False)
+def get_process_executor():
+    """Single worker process that runs the pipeline off the Streamlit script thread
+    
+    The worker keeps its event loop and warmed-up Whisper model between runs.
+    """
+    return ProcessPoolExecutor(max_workers=1)
+
+def submit_workflow_job(*args):
+    """Submit run_workflow_job to the worker, replacing the pool if its process has died
+    
+    A worker killed mid-run (e.g. out of memory while loading Whisper) leaves the
+    cached pool broken for good, so it is dropped and recreated once.
+    """
+    try:
+        return get_process_executor().submit(run_workflow_job, *args)
+    except BrokenProcessPool:
+        get_process_executor.clear()
+        return get_process_executor().submit(run_workflow_job, *args)
+
+@st.cache_resource(show_spinner=False)
+def get_progress_manager():
+    """Manager whose queues carry progress events back from the worker process"""
+    return multiprocessing.Manager()
+
+# Find available background videos
+@st.cache_data(ttl=60, show_spinner=False)
+def find_background_videos():
+    """Find all available background videos in assets folder
+    
+    Returns a tuple of (name, path) tuples. Cached for 60 seconds so reruns
+    don't rescan the filesystem on every widget interaction.
+    """
+    background_videos = []
+    
+    # Check common locations for background videos, with an env override first
+    asset_paths = [
+        Path("assets"),
+        Path("../assets"),
+        Path.home() / "FR8/Brainrot Automacion/assets"
+    ]
+    env_assets_dir = os.getenv("BRAINROT_ASSETS_DIR")
+    if env_assets_dir:
+        asset_paths.insert(0, Path(env_assets_dir))
+    
+    # Several candidates can resolve to the same directory; scan each only once
+    seen_dirs = set()
+    for base_path in asset_paths:
+        resolved = base_path.resolve()
+        if resolved in seen_dirs or not resolved.is_dir():
+            continue
+        seen_dirs.add(resolved)
+        for video_file in base_path.glob("*.mp4"):
+            background_videos.append((video_file.stem, str(video_file)))
+    
+    return tuple(background_videos)
+
+@st.cache_data(show_spinner=False)
+def build_clips_zip(clip_signature):
+    """Bundle clips into a ZIP next to them and return its path
+    
+    clip_signature is a tuple of (index, path, mtime) entries, so the archive
+    is only rebuilt when the clips change.
+    """
+    first_clip = Path(clip_signature[0][1])
+    zip_path = first_clip.parent / f"brainrot_clips_{len(clip_signature)}.zip"
+    
+    # MP4s are already compressed, so store them as-is instead of deflating
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zipf:
+        for i, clip_path, _ in clip_signature:
+            # Add the file to the ZIP with a numbered name
+            zipf.write(clip_path, f"brainrot_clip_{i+1}.mp4")
+    
+    return str(zip_path)
+
+@st.cache_data(show_spinner=False, max_entries=2, ttl=600)
+def read_clip_bytes(clip_path, mtime):
+    """Read a clip once per (path, mtime) for its download button
+    
+    Streamlit holds a download button's data in memory, so only the selected clip
+    is loaded; the small cap and ttl keep the shared cache from growing.
     """
+    return Path(clip_path).read_bytes()
+
+def get_clip_manifest(clips):
+    """Stat each clip once per result set and reuse the (path, mtime) snapshot on reruns
+    
+    mtime is None for clips that are missing or empty.
+    """
+    clips_key = tuple(str(clip_path) for clip_path in clips)
+    cached = st.session_state.get("clip_manifest")
+    if cached is None or cached[0] != clips_key:
+        manifest = []
+        for clip_path in clips:
+            try:
+                stat = os.stat(clip_path)
+                mtime = stat.st_mtime if stat.st_size > 0 else None
+            except OSError:
+                mtime = None
+            manifest.append((clip_path, mtime))
+        cached = (clips_key, tuple(manifest))
+        st.session_state.clip_manifest = cached
+    return cached[1]
+
+@fragment
+def render_clip_grid(clip_manifest):
+    """Display processed clips in a grid with download and share buttons"""
+    clips = clip_manifest
+    col_count = 5  # Number of columns in the grid
+    clips_count = len(clips)
+    rows = (clips_count + col_count - 1) // col_count  # Ceiling division to get number of rows
     
+    for row in range(rows):
+        # Create a row with col_count columns
+        cols = st.columns(col_count)
+        
+        # Fill each column with a clip
+        for col in range(col_count):
+            clip_index = row * col_count + col
+            
+            # Check if we still have clips to display
+            if clip_index < clips_count:
+                clip_path, mtime = clips[clip_index]
+                
+                with cols[col]:
+                    with st.container(border=True):
+                        if mtime is not None:
+                            try:
+                                # Display video title
+                                st.markdown(f'<div class="clip-title">Clip {clip_index+1}</div>', unsafe_allow_html=True)
+                                
+                                # Display video in compact format
+                                st.video(clip_path)
+                                
+                                # Display download and share buttons
+                                col1, col2 = st.columns([1, 1])
+                                with col1:
+                                    # Download buttons read their whole file up front, so only the
+                                    # selected clip gets one instead of every clip on every rerun
+                                    if st.session_state.selected_clip_index == clip_index:
+                                        st.download_button(
+                                            label="💾 Save",
+                                            data=read_clip_bytes(clip_path, mtime),
+                                            file_name=f"brainrot_clip_{clip_index+1}.mp4",
+                                            mime="video/mp4"
+                                        )
+                                    elif st.button("⬇️ Download", key=f"download_{clip_index}"):
+                                        st.session_state.selected_clip_index = clip_index
+                                        st.rerun()
+                                with col2:
+                                    if st.button("📱 Share", key=f"share_{clip_index}"):
+                                        st.info("Copy the downloaded file and upload to TikTok, Instagram, or YouTube Shorts!")
+                                
+                            except Exception as e:
+                                st.error(f"Error displaying clip {clip_index+1}: {str(e)}")
+                                try:
+                                    st.download_button(
+                                        label=f"Download Clip {clip_index+1}",
+                                        data=read_clip_bytes(clip_path, mtime),
+                                        file_name=f"brainrot_clip_{clip_index+1}.mp4",
+                                        mime="video/mp4"
+                                    )
+                                except Exception as download_error:
+                                    st.error(f"Cannot read clip file: {str(download_error)}")
+                        else:
+                            st.error(f"Clip {clip_index+1} file is missing or empty.")
+
+# Pong Game implementation using HTML5/JavaScript for Streamlit
+@fragment
+def show_pong_game():
+    """Display a simple Pong game in Streamlit while processing"""
     # Display the game in Streamlit
-    components.html(pong_game_html, height=450)
+    components.html(PONG_GAME_HTML, height=450)
 
 def show_wandering_icon():
     """Show a wandering icon that can be clicked to redirect to a YouTube video"""
@@ -420,12 +721,8 @@ if 'processing_status' not in st.session_state:
     st.session_state.processing_status = None
 if 'show_games' not in st.session_state:
     st.session_state.show_games = False
-if 'whisper_model' not in st.session_state:
-    # Load whisper model silently at startup
-    try:
-        st.session_state.whisper_model = load_whisper_model("small")
-    except Exception:
-        st.session_state.whisper_model = None
+if 'processing_future' not in st.session_state:
+    st.session_state.processing_future = None
 
 # Set page configuration
 st.set_page_config(
@@ -435,185 +732,11 @@ st.set_page_config(
 )
 
 # Add custom CSS for compact clips and games integration
-st.markdown("""
-<style>
-.compact-video {
-    margin: 0 auto;
-    display: flex;
-    justify-content: center;
-    width: 100%;
-}
-.stVideo {
-    max-width: 200px !important;
-}
-.stVideo video {
-    max-height: 350px !important;
-}
-.clip-container {
-    background: #f0f2f6;
-    border-radius: 10px;
-    padding: 10px;
-    margin: 10px 0;
-    transition: all 0.3s ease;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    height: 100%;
-    display: flex;
-    flex-direction: column;
-}
-.clip-container:hover {
-    box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-    transform: translateY(-2px);
-}
-.clip-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
-    gap: 15px;
-    padding: 20px 0;
-}
-.processing-container {
-    display: flex;
-    flex-direction: column;
-    gap: 20px;
-    padding: 20px;
-    background: #f9f9f9;
-    border-radius: 10px;
-    margin-top: 20px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-}
-.progress-section {
-    padding: 15px;
-    background: white;
-    border-radius: 8px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-}
-.games-section {
-    padding: 15px;
-    background: white;
-    border-radius: 8px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    display: flex;
-    justify-content: center;
-    align-items: center;
-    flex-direction: column;
-}
-.games-section h3 {
-    color: #FF5F6D;
-    margin-bottom: 15px;
-    text-align: center;
-}
-.game-canvas {
-    border-radius: 8px;
-    overflow: hidden;
-    box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-    background: #222;
-}
-.processing-header {
-    display: flex;
-    align-items: center;
-    gap: 10px;
-    margin-bottom: 10px;
-}
-.processing-header h3 {
-    margin: 0;
-}
-.clip-title {
-    font-size: 14px;
-    font-weight: 500;
-    margin-bottom: 8px;
-    text-align: center;
-}
-.clip-buttons {
-    display: flex;
-    justify-content: space-between;
-    margin-top: 8px;
-}
-.clip-buttons button {
-    padding: 3px 8px;
-    font-size: 12px;
-    border-radius: 4px;
-}
-.main-header {
-    background: linear-gradient(90deg, #FF5F6D 0%, #FFC371 100%);
-    padding: 15px;
-    border-radius: 10px;
-    color: white;
-    margin-bottom: 20px;
-    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-}
-.batch-download {
-    background: #f0f2f6;
-    border-radius: 10px;
-    padding: 15px;
-    margin-bottom: 20px;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    text-align: center;
-}
-.highlight-counter {
-    font-weight: bold;
-    margin-top: 10px;
-    color: #FF5F6D;
-}
-.status-text {
-    font-style: italic;
-    margin-bottom: 5px;
-}
-.advanced-options {
-    background: #f6f6f6;
-    border-radius: 10px;
-    padding: 15px;
-    margin-top: 15px;
-    margin-bottom: 20px;
-    border-left: 4px solid #FF5F6D;
-}
-.subtitle-preview {
-    background: #000;
-    color: var(--subtitle-color);
-    padding: 8px 16px;
-    border-radius: 5px;
-    display: inline-block;
-    margin: 10px 0;
-    text-align: center;
-    font-weight: bold;
-    text-shadow: var(--subtitle-stroke);
-}
-.loading-container {
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    justify-content: center;
-    padding: 20px;
-    background: #f9f9f9;
-    border-radius: 10px;
-    margin: 20px 0;
-    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-}
-.loading-step {
-    display: flex;
-    align-items: center;
-    gap: 10px;
-    margin: 5px 0;
-    padding: 8px;
-    border-radius: 5px;
-    width: 100%;
-}
-.loading-step.active {
-    background: rgba(255, 95, 109, 0.1);
-    border-left: 3px solid #FF5F6D;
-}
-.loading-step.completed {
-    color: #4CAF50;
-}
-.loading-spinner {
-    margin-right: 10px;
-}
-</style>
-""", unsafe_allow_html=True)
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Main header with attractive gradient
-st.markdown('<div class="main-header">', unsafe_allow_html=True)
 st.title('🎬 Brainrot Video Automation')
 st.write("Transform YouTube videos into viral mobile-ready Brainrot clips")
-st.markdown('</div>', unsafe_allow_html=True)
 
 # Create temp directory for file storage
 output_dir = Path(tempfile.gettempdir()) / "brainrot_output"
@@ -635,140 +758,144 @@ st.markdown("""
 show_advanced = st.checkbox("Show Advanced Options")
 
 if show_advanced:
-    st.markdown('<div class="advanced-options">', unsafe_allow_html=True)
-    st.subheader("Advanced Configuration")
-    
-    # Create columns for better organization
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Highlight extraction parameters
-        st.subheader("Highlight Settings")
-        min_clip_duration = st.slider("Minimum Clip Duration (seconds)", 5, 30, 10)
-        max_clip_duration = st.slider("Maximum Clip Duration (seconds)", 20, 60, 40)
-        silent_threshold = st.slider("Silent Threshold (lower = more clips)", 0.01, 0.1, 0.04, 0.01)
+    with st.container(border=True):
+        st.subheader("Advanced Configuration")
+        
+        # Create columns for better organization
+        col1, col2 = st.columns(2)
         
-        # Background video selection
-        st.subheader("Background Video")
-        background_videos = find_background_videos()
-        if background_videos:
-            bg_options = ["Automatic", "Dynamic (Random per clip)"] + [video["name"] for video in background_videos]
-            selected_bg = st.selectbox("Select background video", bg_options)
+        with col1:
+            # Highlight extraction parameters
+            st.subheader("Highlight Settings")
+            min_clip_duration = st.slider("Minimum Clip Duration (seconds)", 5, 30, 10)
+            max_clip_duration = st.slider("Maximum Clip Duration (seconds)", 20, 60, 40)
+            silent_threshold = st.slider("Silent Threshold (lower = more clips)", 0.01, 0.1, 0.04, 0.01)
             
-            if selected_bg == "Automatic":
-                st.info("The app will automatically select a background video")
+            # Background video selection
+            st.subheader("Background Video")
+            background_videos = find_background_videos()
+            if background_videos:
+                bg_options = ["Automatic", "Dynamic (Random per clip)"] + [name for name, _ in background_videos]
+                selected_bg = st.selectbox("Select background video", bg_options)
+                
+                if selected_bg == "Automatic":
+                    st.info("The app will automatically select a background video")
+                    bg_video_path = None
+                    use_dynamic = False
+                elif selected_bg == "Dynamic (Random per clip)":
+                    st.info("🎲 Each clip will use a randomly selected background video, starting at a random point!")
+                    bg_video_path = "dynamic"
+                    use_dynamic = True
+                else:
+                    for video_name, video_path in background_videos:
+                        if video_name == selected_bg:
+                            bg_video_path = video_path
+                            st.success(f"✅ Using {selected_bg} as background video")
+                            use_dynamic = False
+                            break
+            else:
+                st.error("⚠️ No background videos found! Please add MP4 files to the assets folder.")
                 bg_video_path = None
                 use_dynamic = False
-            elif selected_bg == "Dynamic (Random per clip)":
-                st.info("🎲 Each clip will use a randomly selected background video, starting at a random point!")
-                bg_video_path = "dynamic"
-                use_dynamic = True
-            else:
-                for video in background_videos:
-                    if video["name"] == selected_bg:
-                        bg_video_path = video["path"]
-                        st.success(f"✅ Using {selected_bg} as background video")
-                        use_dynamic = False
-                        break
-        else:
-            st.error("⚠️ No background videos found! Please add MP4 files to the assets folder.")
-            bg_video_path = None
-            use_dynamic = False
-    
-    with col2:
-        # Subtitle customization
-        st.subheader("Subtitle Settings")
-        
-        # Style selection dropdown
-        style_names = list(SUBTITLE_STYLES.keys())
-        selected_style = st.selectbox("Select Subtitle Style", style_names, index=0)
-        
-        # Get selected style config
-        style_config = SUBTITLE_STYLES[selected_style]
         
-        # Show style parameters with current values
-        subtitle_color = st.color_picker(
-            "Subtitle Text Color", 
-            f"#{style_config['text_color']}"
-        )
-        # Remove # from color for internal use
-        text_color_hex = subtitle_color.lstrip('#')
-        
-        subtitle_outline = st.checkbox(
-            "Add Text Outline", 
-            value=style_config['use_outline']
-        )
-        
-        outline_color = st.color_picker(
-            "Outline Color", 
-            f"#{style_config['outline_color']}" if style_config['outline_color'] else "#000000"
-        ) if subtitle_outline else "#000000"
-        # Remove # from color for internal use
-        outline_color_hex = outline_color.lstrip('#')
-        
-        subtitle_size = st.slider(
-            "Subtitle Size", 
-            8, 48, 
-            value=style_config['font_size']
-        )
-        
-        # Build custom style config from UI inputs
-        custom_style_config = {
-            "font_size": subtitle_size,
-            "text_color": text_color_hex,
-            "use_outline": subtitle_outline,
-            "outline_color": outline_color_hex if subtitle_outline else None
-        }
-        
-        # Preview subtitle style
-        subtitle_stroke = "2px 2px 3px #000000" if subtitle_outline else "none"
-        st.markdown(
-            f"""
-            <style>
-            :root {{
-                --subtitle-color: {subtitle_color};
-                --subtitle-stroke: {subtitle_stroke};
-            }}
-            </style>
-            <p>Subtitle Preview:</p>
-            <div class="subtitle-preview" style="font-size: {subtitle_size * 1.5}px; color: {subtitle_color}; text-shadow: {subtitle_stroke};">
-                This is how your subtitles will look
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        
-        # Display style description
-        st.markdown(f"**Current Style: {selected_style}**")
-        
-        # Add option to save custom settings as a new style
-        if st.button("Apply Custom Settings"):
-            # Update the selected style with custom settings
-            SUBTITLE_STYLES[selected_style] = custom_style_config
-            st.success(f"Updated {selected_style} style with your custom settings!")
-        
-        # Add option to reset to default style
-        if st.button("Reset to Default"):
-            # Restore original style
-            st.experimental_rerun()
-        
-        # Video quality settings
-        st.subheader("Output Quality")
-        video_quality = st.select_slider(
-            "Video Quality",
-            options=["Low", "Medium", "High", "Very High"],
-            value="Medium"
-        )
-        quality_map = {
-            "Low": 28,
-            "Medium": 23,
-            "High": 18,
-            "Very High": 15
-        }
-        
-    st.markdown('</div>', unsafe_allow_html=True)
+        with col2:
+            # Subtitle customization
+            st.subheader("Subtitle Settings")
+            
+            # Style selection dropdown
+            style_names = list(SUBTITLE_STYLES.keys())
+            selected_style = st.selectbox("Select Subtitle Style", style_names, index=0)
+            
+            # Get selected style config; applied custom settings live in this session only
+            custom_styles = st.session_state.setdefault("custom_styles", {})
+            style_config = custom_styles.get(selected_style, SUBTITLE_STYLES[selected_style])
+            
+            # Show style parameters with current values
+            subtitle_color = st.color_picker(
+                "Subtitle Text Color", 
+                f"#{style_config['text_color']}"
+            )
+            # Remove # from color for internal use
+            text_color_hex = subtitle_color.lstrip('#')
+            
+            subtitle_outline = st.checkbox(
+                "Add Text Outline", 
+                value=style_config['use_outline']
+            )
+            
+            outline_color = st.color_picker(
+                "Outline Color", 
+                f"#{style_config['outline_color']}" if style_config['outline_color'] else "#000000"
+            ) if subtitle_outline else "#000000"
+            # Remove # from color for internal use
+            outline_color_hex = outline_color.lstrip('#')
+            
+            subtitle_size = st.slider(
+                "Subtitle Size", 
+                8, 48, 
+                value=style_config['font_size']
+            )
+            
+            # Build custom style config from UI inputs
+            custom_style_config = {
+                "font_size": subtitle_size,
+                "text_color": text_color_hex,
+                "use_outline": subtitle_outline,
+                "outline_color": outline_color_hex if subtitle_outline else None
+            }
+            
+            # Preview subtitle style
+            subtitle_stroke = "2px 2px 3px #000000" if subtitle_outline else "none"
+            st.markdown(
+                f"""
+                <style>
+                :root {{
+                    --subtitle-color: {subtitle_color};
+                    --subtitle-stroke: {subtitle_stroke};
+                }}
+                </style>
+                <p>Subtitle Preview:</p>
+                <div class="subtitle-preview" style="font-size: {subtitle_size * 1.5}px; color: {subtitle_color}; text-shadow: {subtitle_stroke};">
+                    This is how your subtitles will look
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+            
+            # Display style description
+            st.markdown(f"**Current Style: {selected_style}**")
+            
+            # Add option to save custom settings as a new style
+            # The current settings are sent with every job as subtitle_config; applying them
+            # only makes them this session's starting values for the style
+            if st.button("Apply Custom Settings"):
+                custom_styles[selected_style] = custom_style_config
+                st.success(f"Updated {selected_style} style with your custom settings!")
+            
+            # Add option to reset to default style
+            if st.button("Reset to Default"):
+                # Restore original style
+                custom_styles.pop(selected_style, None)
+                st.experimental_rerun()
+            
+            # Video quality settings
+            st.subheader("Output Quality")
+            video_quality = st.select_slider(
+                "Video Quality",
+                options=["Low", "Medium", "High", "Very High"],
+                value="Medium"
+            )
+            quality_map = {
+                "Low": 28,
+                "Medium": 23,
+                "High": 18,
+                "Very High": 15
+            }
+            
 else:
     # Set default values
+    selected_style = "default"
+    custom_style_config = None
     min_clip_duration = 10
     max_clip_duration = 40
     silent_threshold = 0.04
@@ -788,7 +915,7 @@ else:
     st.subheader("Background Video")
     background_videos = find_background_videos()
     if background_videos:
-        bg_options = ["Automatic", "Dynamic (Random per clip)"] + [video["name"] for video in background_videos]
+        bg_options = ["Automatic", "Dynamic (Random per clip)"] + [name for name, _ in background_videos]
         selected_bg = st.selectbox("Select background video", bg_options)
         
         if selected_bg == "Automatic":
@@ -800,9 +927,9 @@ else:
             bg_video_path = "dynamic"
             use_dynamic = True
         else:
-            for video in background_videos:
-                if video["name"] == selected_bg:
-                    bg_video_path = video["path"]
+            for video_name, video_path in background_videos:
+                if video_name == selected_bg:
+                    bg_video_path = video_path
                     st.success(f"✅ Using {selected_bg} as background video")
                     use_dynamic = False
                     break
@@ -814,42 +941,17 @@ else:
 # Process button
 process_button = st.button("Process YouTube Video", type="primary", disabled=not youtube_url)
 
-# Create a function to process the video using BrainrotWorkflow
-async def process_video_with_workflow(url, output_dir, bg_video_path, progress_queue=None, use_dynamic=False, **config):
-    """Process a video using BrainrotWorkflow"""
-    try:
-        # Get the selected style from config
-        selected_style = config.get("subtitle_style", "default")
-        subtitle_config = config.get("subtitle_config", None)
-        
-        # Configure the workflow with user settings including subtitle style
-        workflow = BrainrotWorkflow(
-            output_dir=output_dir,
-            subtitle_style=selected_style
-        )
-        
-        # Configure highlight extraction parameters
-        workflow.highlight_extractor.min_clip_duration = config.get("min_clip_duration", 10)
-        workflow.highlight_extractor.max_clip_duration = config.get("max_clip_duration", 40)
-        workflow.highlight_extractor.silent_threshold = config.get("silent_threshold", 0.04)
-        
-        # Send initial notification to progress queue if available
-        if progress_queue:
-            await progress_queue.put({"type": "step", "step": 1, "highlight": 0, "description": "Starting download"})
-        
-        # Process the video with subtitle config and dynamic background setting
-        return await workflow.process_video(
-            url, 
-            bg_video_path, 
-            subtitle_config,
-            use_dynamic_background=use_dynamic
-        )
-        
-    except Exception as e:
-        print(f"Error in workflow: {e}")
-        if progress_queue:
-            await progress_queue.put({"type": "error", "error": str(e)})
-        return []
+def render_loading_gif(placeholder, gif_url):
+    """Show a loading GIF centered in the given placeholder"""
+    placeholder.markdown(f'<div style="display:flex; justify-content:center; margin:20px 0;"><img src="{gif_url}" width="200px" /></div>', unsafe_allow_html=True)
+
+def render_ready_clip(placeholder, ready_clips):
+    """Show the most recently finished clip in the given placeholder while the run continues"""
+    if not ready_clips:
+        return
+    with placeholder.container(border=True):
+        st.subheader(f"✅ {len(ready_clips)} clip{'s' if len(ready_clips) != 1 else ''} ready")
+        st.video(ready_clips[-1])
 
 if youtube_url and process_button:
     # Clear previous results
@@ -857,12 +959,48 @@ if youtube_url and process_button:
     st.session_state.processing_status = "processing"
     st.session_state.show_games = True
     
+    run_output_dir = str(output_dir / f"run_{int(time.time())}")
+    os.makedirs(run_output_dir, exist_ok=True)
+    
+    config = {
+        "min_clip_duration": min_clip_duration,
+        "max_clip_duration": max_clip_duration,
+        "silent_threshold": silent_threshold,
+        "subtitle_style": selected_style,  # Pass the style name
+        "subtitle_config": custom_style_config,  # Pass the custom config
+        "crf_value": quality_map[video_quality]
+    }
+    
+    # Run the pipeline in a worker process so the script thread only renders progress;
+    # events come back through a Manager queue
+    progress_queue = get_progress_manager().Queue()
+    st.session_state.progress_queue = progress_queue
+    st.session_state.processing_future = submit_workflow_job(
+        youtube_url,
+        run_output_dir,
+        bg_video_path,
+        progress_queue,
+        use_dynamic,
+        config
+    )
+    st.session_state.progress_state = {
+        "stage": "Downloading YouTube video",
+        "pct": 10,
+        "status": "Initializing...",
+        "counter": "Getting ready...",
+        "total": 0,
+        "completed": 0,
+        "ready_clips": []
+    }
+    st.session_state.current_gif = random.choice(LOADING_GIFS)
+
+if st.session_state.processing_status == "processing" and st.session_state.get("processing_future") is not None:
+    progress = st.session_state.progress_state
+    
     # Create a container for the processing UI
-    processing_container = st.container()
+    processing_container = st.container(border=True)
     
     with processing_container:
-        st.markdown('<div class="processing-container">', unsafe_allow_html=True)
-        
         # Processing header
         st.markdown('<div class="processing-header"><h3>🔄 Processing Your Video</h3></div>', unsafe_allow_html=True)
         
@@ -870,143 +1008,96 @@ if youtube_url and process_button:
         show_wandering_icon()
         
         # Progress section
-        st.markdown('<div class="progress-section">', unsafe_allow_html=True)
-        st.subheader("Progress")
-        progress_text = st.empty()
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        status_text.markdown('<div class="status-text">Initializing...</div>', unsafe_allow_html=True)
-        highlight_counter = st.empty()
-        highlight_counter.markdown('<div class="highlight-counter">Getting ready...</div>', unsafe_allow_html=True)
-        
-        # Add a container for fun loading GIFs
-        loading_gif_container = st.empty()
-        # Store in session state for reference across functions
-        if 'current_gif' not in st.session_state:
-            st.session_state.current_gif = random.choice(LOADING_GIFS)
-        loading_gif_container.markdown(f'<div style="display:flex; justify-content:center; margin:20px 0;"><img src="{st.session_state.current_gif}" width="200px" /></div>', unsafe_allow_html=True)
+        with st.container(border=True):
+            st.subheader("Progress")
+            progress_text = st.empty()
+            progress_text.text(f"{progress['stage']}...")
+            progress_bar = st.progress(progress["pct"])
+            status_text = st.empty()
+            status_text.text(progress["status"])
+            highlight_counter = st.empty()
+            highlight_counter.text(progress["counter"])
+            
+            # Add a container for fun loading GIFs
+            loading_gif_container = st.empty()
+            render_loading_gif(loading_gif_container, st.session_state.current_gif)
         
-        progress_text.text("Downloading YouTube video...")
-        progress_bar.progress(10)
-        st.markdown('</div>', unsafe_allow_html=True)
+        # Finished clips can be watched while the rest are still rendering
+        ready_clip_preview = st.empty()
+        render_ready_clip(ready_clip_preview, progress["ready_clips"])
         
         # Games section below processing
         if st.session_state.show_games:
-            st.markdown('<div class="games-section">', unsafe_allow_html=True)
-            
-            # Add auto-refresh for games
-            st.markdown("""
-            <script>
-            // Auto-refresh the games section every 2 seconds during processing
-            function refreshGames() {
-                if (window.frameElement) {
-                    window.frameElement.contentWindow.location.reload();
-                }
-            }
-            setInterval(refreshGames, 2000);
-            </script>
-            """, unsafe_allow_html=True)
+            with st.container(border=True):
+                st.subheader("🎮 Entertainment While You Wait")
+                st.write("Play a game of Pong while your video is being processed!")
+                show_pong_game()
+    
+    def apply_progress_message(msg, last_status_update):
+        """Update the progress state and placeholders for one worker event"""
+        if msg["type"] == "stage":
+            progress["stage"] = msg["name"]
+            progress_text.text(f"{msg['name']}...")
+            # Coalesce tiny increments to keep widget updates down
+            if msg["pct"] - progress["pct"] >= 2:
+                progress["pct"] = msg["pct"]
+                progress_bar.progress(progress["pct"])
             
-            st.subheader("🎮 Entertainment While You Wait")
-            st.write("Play a game of Pong while your video is being processed!")
-            show_pong_game()
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            # Update the loading GIF with a new random one
+            new_gif = random.choice([gif for gif in LOADING_GIFS if gif != st.session_state.current_gif])
+            render_loading_gif(loading_gif_container, new_gif)
+            st.session_state.current_gif = new_gif
+        elif msg["type"] == "total":
+            progress["total"] = msg["count"]
+            progress["status"] = f"Processing {progress['total']} highlights..."
+            status_text.text(progress["status"])
+        elif msg["type"] == "step":
+            progress["status"] = f"Step {msg['step']}: {msg['description']} (Highlight {msg['highlight']})"
+            # Cap per-clip step updates at ~10 Hz; parallel clips emit them in bursts
+            now = time.monotonic()
+            if now - last_status_update >= 0.1:
+                last_status_update = now
+                status_text.text(progress["status"])
+        elif msg["type"] == "completed":
+            progress["completed"] += 1
+            total_highlights = progress["total"]
+            percentage = int((progress["completed"] / total_highlights) * 100) if total_highlights > 0 else 0
+            progress["counter"] = f"Completed: {progress['completed']}/{total_highlights} highlights ({percentage}%)"
+            highlight_counter.text(progress["counter"])
+            # Update progress bar based on completed highlights
+            if total_highlights > 0:
+                overall_progress = int(min(95, 40 + (progress["completed"] / total_highlights) * 55))
+                if overall_progress - progress["pct"] >= 2:
+                    progress["pct"] = overall_progress
+                    progress_bar.progress(progress["pct"])
+        elif msg["type"] == "clip_ready":
+            progress["ready_clips"].append(msg["path"])
+            render_ready_clip(ready_clip_preview, progress["ready_clips"])
+        elif msg["type"] == "error":
+            st.error(f"Error: {msg['error']}")
+        return last_status_update
+    
+    # Poll the worker; if a widget interaction reruns the script, the next run
+    # picks the same future and queue back up from session state
+    future = st.session_state.processing_future
+    progress_queue = st.session_state.progress_queue
+    last_status_update = 0.0
+    while True:
+        finished = future.done()
+        try:
+            while True:
+                last_status_update = apply_progress_message(progress_queue.get_nowait(), last_status_update)
+        except queue.Empty:
+            pass
+        if finished:
+            break
+        time.sleep(0.2)
+    
+    st.session_state.processing_future = None
+    st.session_state.progress_queue = None
     
     try:
-        run_output_dir = str(output_dir / f"run_{int(time.time())}")
-        os.makedirs(run_output_dir, exist_ok=True)
-        
-        async def process_with_progress_updates():
-            # Store current GIF in session state to be accessible across functions
-            if 'current_gif' not in st.session_state:
-                st.session_state.current_gif = random.choice(LOADING_GIFS)
-            
-            async def update_progress():
-                steps = ["Downloading", "Extracting highlights", "Formatting videos", "Transcribing", 
-                         "Preparing background", "Adding subtitles", "Creating final videos", "Optimizing"]
-                progress_values = [20, 30, 40, 60, 70, 80, 90, 95]
-                
-                for i, (step, value) in enumerate(zip(steps, progress_values)):
-                    progress_text.text(f"{step}...")
-                    progress_bar.progress(value)
-                    
-                    # Update the loading GIF with a new random one
-                    new_gif = random.choice([gif for gif in LOADING_GIFS if gif != st.session_state.current_gif])
-                    loading_gif_container.markdown(f'<div style="display:flex; justify-content:center; margin:20px 0;"><img src="{new_gif}" width="200px" /></div>', unsafe_allow_html=True)
-                    st.session_state.current_gif = new_gif
-                    
-                    await asyncio.sleep(2)
-            
-            progress_task = asyncio.create_task(update_progress())
-            
-            try:
-                # Create a queue for tracking highlight processing
-                progress_queue = asyncio.Queue()
-                
-                # Track highlights processing
-                async def track_highlights_progress():
-                    total_highlights = 0
-                    completed_highlights = 0
-                    
-                    while True:
-                        msg = await progress_queue.get()
-                        
-                        if msg["type"] == "total":
-                            total_highlights = msg["count"]
-                            status_text.markdown(f'<div class="status-text">Processing {total_highlights} highlights...</div>', unsafe_allow_html=True)
-                        elif msg["type"] == "step":
-                            current_step = msg["step"]
-                            current_highlight = msg["highlight"]
-                            status_text.markdown(f'<div class="status-text">Step {current_step}: {msg["description"]} (Highlight {current_highlight})</div>', unsafe_allow_html=True)
-                        elif msg["type"] == "completed":
-                            completed_highlights += 1
-                            percentage = int((completed_highlights / total_highlights) * 100) if total_highlights > 0 else 0
-                            highlight_counter.markdown(f'<div class="highlight-counter">Completed: {completed_highlights}/{total_highlights} highlights ({percentage}%)</div>', unsafe_allow_html=True)
-                            # Update progress bar based on completed highlights
-                            overall_progress = min(95, 40 + (completed_highlights / total_highlights) * 55)
-                            progress_bar.progress(int(overall_progress))
-                        elif msg["type"] == "error":
-                            st.error(f"Error: {msg['error']}")
-                        
-                        # Check if we're done
-                        if msg.get("done", False) or (total_highlights > 0 and completed_highlights >= total_highlights):
-                            break
-                
-                tracking_task = asyncio.create_task(track_highlights_progress())
-                
-                # Call process_video with progress updates
-                config = {
-                    "min_clip_duration": min_clip_duration,
-                    "max_clip_duration": max_clip_duration,
-                    "silent_threshold": silent_threshold,
-                    "subtitle_style": selected_style,  # Pass the style name
-                    "subtitle_config": custom_style_config,  # Pass the custom config
-                    "crf_value": quality_map[video_quality]
-                }
-                
-                result = await process_video_with_workflow(
-                    youtube_url, 
-                    run_output_dir, 
-                    bg_video_path, 
-                    progress_queue,
-                    use_dynamic=use_dynamic,
-                    **config
-                )
-                
-                # Signal completion
-                await progress_queue.put({"type": "done", "done": True})
-                
-                # Wait for tracking to finish
-                await tracking_task
-                progress_task.cancel()
-                return result
-            except Exception as e:
-                progress_task.cancel()
-                raise e
-        
-        final_clips = asyncio.run(process_with_progress_updates())
+        final_clips = future.result()
         
         if final_clips and len(final_clips) > 0:
             progress_text.text("Processing complete!")
@@ -1015,8 +1106,6 @@ if youtube_url and process_button:
             st.session_state.processing_status = "completed"
             st.session_state.show_games = False
             
-            # Add a celebratory message with animation
-            st.balloons()
             st.success(f"🎉 Successfully created {len(final_clips)} clips!")
         else:
             st.error("❌ No clips were generated. Please try another video.")
@@ -1024,13 +1113,20 @@ if youtube_url and process_button:
             st.session_state.show_games = False
             
     except Exception as e:
-        st.error(f"Error processing video: {str(e)}")
+        error_msg = str(e)
+        if isinstance(e, BrokenProcessPool):
+            # The worker process died; start a fresh one for the next run
+            get_process_executor.clear()
+            error_msg = "the worker process exited unexpectedly"
+        st.error(f"Error processing video: {error_msg}")
         st.session_state.processed_clips = []
         st.session_state.processing_status = "error"
         st.session_state.show_games = False
 
 # Display processed clips in a grid layout
 if st.session_state.processed_clips:
+    clip_manifest = get_clip_manifest(st.session_state.processed_clips)
+    
     st.header("Step 2: Preview Your Clips")
     
     # Add a short introduction to the clips
@@ -1038,97 +1134,36 @@ if st.session_state.processed_clips:
     
     # Add Download All button at the top
     if len(st.session_state.processed_clips) > 1:
-        st.markdown('<div class="batch-download">', unsafe_allow_html=True)
-        st.subheader("Batch Download")
-        st.write(f"Download all {len(st.session_state.processed_clips)} clips as a single ZIP file.")
-        
-        if st.button("📦 Download All Clips as ZIP", type="primary"):
-            # Create a temporary ZIP file with all clips
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_zip_file:
-                zip_path = temp_zip_file.name
-                
-            with zipfile.ZipFile(zip_path, 'w') as zipf:
-                for i, clip_path in enumerate(st.session_state.processed_clips):
-                    if os.path.exists(clip_path) and os.path.getsize(clip_path) > 0:
-                        # Add the file to the ZIP with a numbered name
-                        zipf.write(clip_path, f"brainrot_clip_{i+1}.mp4")
+        with st.container(border=True):
+            st.subheader("Batch Download")
+            st.write(f"Download all {len(st.session_state.processed_clips)} clips as a single ZIP file.")
             
-            # Provide the ZIP file for download
-            with open(zip_path, "rb") as f:
-                st.download_button(
-                    label="⬇️ Download ZIP File",
-                    data=f.read(),
-                    file_name=f"brainrot_clips_{len(st.session_state.processed_clips)}.zip",
-                    mime="application/zip"
+            if st.button("📦 Download All Clips as ZIP", type="primary"):
+                # Key the archive on path + mtime so repeated clicks reuse it
+                clip_signature = tuple(
+                    (i, clip_path, mtime)
+                    for i, (clip_path, mtime) in enumerate(clip_manifest)
+                    if mtime is not None
                 )
-            
-            # Clean up the temporary ZIP file
-            try:
-                os.unlink(zip_path)
-            except:
-                pass
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Display clips in a 4-column grid
-    col_count = 5  # Number of columns in the grid
-    clips_count = len(st.session_state.processed_clips)
-    rows = (clips_count + col_count - 1) // col_count  # Ceiling division to get number of rows
-    
-    for row in range(rows):
-        # Create a row with col_count columns
-        cols = st.columns(col_count)
-        
-        # Fill each column with a clip
-        for col in range(col_count):
-            clip_index = row * col_count + col
-            
-            # Check if we still have clips to display
-            if clip_index < clips_count:
-                clip_path = st.session_state.processed_clips[clip_index]
-                
-                with cols[col]:
-                    st.markdown(f'<div class="clip-container">', unsafe_allow_html=True)
-                    
-                    if os.path.exists(clip_path) and os.path.getsize(clip_path) > 0:
-                        try:
-                            # Display video title
-                            st.markdown(f'<div class="clip-title">Clip {clip_index+1}</div>', unsafe_allow_html=True)
-                            
-                            # Display video in compact format with CSS class
-                            st.markdown('<div class="compact-video">', unsafe_allow_html=True)
-                            st.video(clip_path)
-                            st.markdown('</div>', unsafe_allow_html=True)
-                            
-                            # Display download and share buttons
-                            col1, col2 = st.columns([1, 1])
-                            with col1:
-                                with open(clip_path, "rb") as file:
-                                    st.download_button(
-                                        label="⬇️ Download",
-                                        data=file.read(),
-                                        file_name=f"brainrot_clip_{clip_index+1}.mp4",
-                                        mime="video/mp4"
-                                    )
-                            with col2:
-                                if st.button("📱 Share", key=f"share_{clip_index}"):
-                                    st.info("Copy the downloaded file and upload to TikTok, Instagram, or YouTube Shorts!")
-                            
-                        except Exception as e:
-                            st.error(f"Error displaying clip {clip_index+1}: {str(e)}")
-                            try:
-                                with open(clip_path, "rb") as file:
-                                    st.download_button(
-                                        label=f"Download Clip {clip_index+1}",
-                                        data=file.read(),
-                                        file_name=f"brainrot_clip_{clip_index+1}.mp4",
-                                        mime="video/mp4"
-                                    )
-                            except Exception as download_error:
-                                st.error(f"Cannot read clip file: {str(download_error)}")
-                    else:
-                        st.error(f"Clip {clip_index+1} file is missing or empty.")
+                if clip_signature:
+                    zip_path = build_clips_zip(clip_signature)
+                    if not os.path.exists(zip_path):
+                        build_clips_zip.clear()
+                        zip_path = build_clips_zip(clip_signature)
                     
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    # Provide the ZIP file for download as a file handle rather than a bytes copy
+                    with open(zip_path, "rb") as f:
+                        st.download_button(
+                            label="⬇️ Download ZIP File",
+                            data=f,
+                            file_name=f"brainrot_clips_{len(st.session_state.processed_clips)}.zip",
+                            mime="application/zip"
+                        )
+                else:
+                    st.error("No clip files are available to bundle.")
+    
+    # Display clips in a grid; rendered as a fragment so widget clicks only rerun the grid
+    render_clip_grid(clip_manifest)
 
 elif st.session_state.processing_status == "error":
     st.error("Processing failed. Please try again with a different YouTube URL.")